@@ -1,25 +1,36 @@
 import sys
 import os
+import errno
 import shutil
 import json
 import time
 import hashlib
+import functools
+import itertools
 import re  # Added for Regex matching
 import zipfile  # Added for backup feature
+import sqlite3
+import numbers
+import struct
+from xml.etree import ElementTree
+import multiprocessing
+import threading
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import nullcontext
 from PIL import Image, UnidentifiedImageError
-# Add PIL.ExifTags for accessing metadata by name
-from PIL.ExifTags import TAGS
 from datetime import datetime  # removed unused timedelta
 
 # --- Qt Imports ---
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLineEdit, QTextEdit, QProgressBar, QCheckBox,
+    QPushButton, QLineEdit, QPlainTextEdit, QProgressBar, QCheckBox,
     QFileDialog, QMessageBox, QLabel,
-    QTableWidget, QTableWidgetItem, QHeaderView, QDialog, QComboBox,
+    QTableWidget, QTableWidgetItem, QTableView, QHeaderView, QDialog, QComboBox,
     QSystemTrayIcon, QMenu, QFrame
 )
-from PySide6.QtCore import QObject, Signal, QThread, Slot, Qt, QPoint
+from PySide6.QtCore import QObject, Signal, QThread, Slot, Qt, QPoint, QTimer, QAbstractTableModel, QModelIndex
 from PySide6.QtGui import QColor, QIcon, QAction, QDropEvent, QDragEnterEvent, QFont
 
 # --- Icon Library ---
@@ -40,15 +51,39 @@ except ImportError:
     PYPDF2_AVAILABLE = False
 
 try:
-    import docx
-    DOCX_AVAILABLE = True
+    import fcntl  # Reflink (FICLONE) deduplication; not available on Windows
 except ImportError:
-    DOCX_AVAILABLE = False
+    fcntl = None
 
 
 # --- Constants ---
 LOG_FILE_NAME = ".organizer_log.json"  # Still used for the single 'undo' log
 SETTINGS_FILE_NAME = ".organizer_settings.json"  # Still used for theme, rules, categories
+INDEX_FILE_NAME = ".organizer_index.db"  # Per-folder index of results for incremental previews
+HASH_CACHE_FILE_NAME = ".organizer_hashes.db"  # Content digests reused across duplicate scans
+# Tuning knobs, stored under "performance" in settings and profiles
+PERFORMANCE_DEFAULTS = {
+    "metadata_workers": 0,  # Processes extracting EXIF/PDF/DOCX data; 0 = CPU cores - 1, 1 = no pool
+    "pdf_scan_pages": 2,  # Leading PDF pages scanned by content rules
+    "pdf_scan_max_mb": 256,  # PDFs above this size skip content rules; 0 = no limit
+    "hash_workers": 0,  # Threads hashing files for duplicate scans; 0 = CPU cores (max 8)
+    "duplicate_hash_algorithm": "md5",  # md5, blake2b or sha256
+    "hash_cache_max_entries": 500000,  # Least recently used digests beyond this are evicted; 0 = no cache
+    "image_similarity_distance": 6,  # Max differing dHash bits (of 64) for "Similar Images" duplicates
+    "document_similarity_threshold": 0.8,  # Min estimated Jaccard similarity for "Similar Documents"
+    "document_similarity_pages": 200,  # Leading PDF pages compared by "Similar Documents" (rules use pdf_scan_pages)
+    "document_similarity_text_mb": 4,  # Text compared per document; only longer documents are compared by their start
+    "copy_workers_per_device": 4,  # Concurrent copies/cross-device moves reading or writing one device
+    # Check before a cross-device move removes its source. "full" (default): hash the data in the
+    # same pass that copies it, and check the copy's size and that the source didn't change
+    # meanwhile; the digest goes to the hash cache. "readback": "full", then fsync the copy and
+    # read it back once against the digest. "sampled" (opt-in): copy in the kernel and compare
+    # only the size and VERIFY_SAMPLE_BLOCKS blocks of 64 KB, so corruption elsewhere in the
+    # file goes unnoticed. "off": no check. true/false = full/off.
+    "verify_cross_device_moves": "full",
+}
+# EXIF tags used by rules/categories; only these are persisted in the index
+INDEXED_EXIF_TAGS = ("DateTimeOriginal", "DateTime", "Model", "LensModel", "Artist", "FNumber", "ImageDescription")
 
 # --- Aesthetic Stylesheets (QSS) ---
 DARK_BLUE_THEME = """
@@ -125,7 +160,7 @@ DARK_BLUE_THEME = """
     }
     #LogToolsWidget QPushButton:hover { background-color: #30363d; }
     
-    QTextEdit {
+    QPlainTextEdit {
         background-color: #0d1117; /* Match main background */
         border: none;
         color: #8b949e; /* GitHub dark secondary text for logs */
@@ -138,7 +173,7 @@ DARK_BLUE_THEME = """
 
     /* --- Dialog Styles --- */
     QDialog { background-color: #161b22; border: 1px solid #30363d; }
-    QDialog QLineEdit, QDialog QComboBox, QDialog QTableWidget, QDialog QSpinBox { /* Added SpinBox */
+    QDialog QLineEdit, QDialog QComboBox, QDialog QTableView, QDialog QSpinBox { /* Added SpinBox */
         background-color: #0d1117; border: 1px solid #30363d;
         border-radius: 6px; padding: 8px; color: #c9d1d9; font-size: 9pt;
     }
@@ -213,13 +248,13 @@ LIGHT_BLUE_THEME = """
     }
     #LogToolsWidget QPushButton:hover { background-color: #e1e4e8; }
 
-    QTextEdit { background-color: #f6f8fa; border: none; color: #57606a; font-size: 8.5pt; padding: 10px; border-radius: 6px;}
+    QPlainTextEdit { background-color: #f6f8fa; border: none; color: #57606a; font-size: 8.5pt; padding: 10px; border-radius: 6px;}
     QProgressBar { border: none; text-align: center; height: 5px; background-color: #e1e4e8; border-radius: 2.5px; margin: 5px 10px 8px 10px; }
     QProgressBar::chunk { background-color: #1f883d; border-radius: 2.5px; } /* GitHub light green */
 
     /* --- Dialog Styles --- */
     QDialog { background-color: #ffffff; border: 1px solid #d0d7de; }
-    QDialog QLineEdit, QDialog QComboBox, QDialog QTableWidget, QDialog QSpinBox { /* Added SpinBox */
+    QDialog QLineEdit, QDialog QComboBox, QDialog QTableView, QDialog QSpinBox { /* Added SpinBox */
         background-color: #f6f8fa; border: 1px solid #d0d7de; border-radius: 6px; padding: 8px; color: #24292f; font-size: 9pt;
     }
     QDialog QHeaderView::section { background-color: #f6f8fa; padding: 5px; border: none; color: #57606a; font-weight: bold;}
@@ -231,13 +266,1834 @@ LIGHT_BLUE_THEME = """
 """
 
 
+# --- Tree Snapshot ---
+class FileEntry:
+    """Stat data for one file, captured once per os.DirEntry and reused by every operation."""
+
+    __slots__ = ("path", "name", "size", "mtime_ns", "inode", "dev")
+
+    def __init__(self, path, name, size, mtime_ns, inode, dev):
+        self.path = path
+        self.name = name
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.inode = inode  # 0 where the platform doesn't report it cheaply (Windows scandir)
+        self.dev = dev
+
+    @classmethod
+    def from_path(cls, path):
+        """Builds an entry with a single os.stat (used when no snapshot is available, e.g. the watcher)."""
+        st = os.stat(path)
+        return cls(path, os.path.basename(path), st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev)
+
+    @property
+    def mtime(self):
+        return self.mtime_ns / 1e9
+
+
+class TreeSnapshot:
+    """Single-pass os.scandir walk of a folder, shared by preview, duplicate scan, stats and cleanup."""
+
+    def __init__(self, root):
+        self.root = root
+        self.files = []  # FileEntry objects, hidden files included
+        self.dir_order = []  # Directories in top-down order (reverse it for bottom-up)
+        self.dir_entry_counts = {}  # Directory -> number of entries it held when scanned
+        self.errors = []  # (path, exc) pairs for entries that could not be read
+
+    @classmethod
+    def scan(cls, root, recursive=True, skip_root_dirs=()):
+        """Walks `root` once. `skip_root_dirs` holds lower-cased folder names pruned at the top level."""
+        snapshot = cls(root)
+        stack = [root]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError as exc:
+                if current == root:
+                    raise
+                snapshot.errors.append((current, exc))
+                continue
+
+            snapshot.dir_order.append(current)
+            snapshot.dir_entry_counts[current] = len(entries)
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if current == root and entry.name.lower() in skip_root_dirs:
+                        continue
+                    if recursive and not entry.is_symlink():
+                        subdirs.append(entry.path)
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError as exc:
+                    snapshot.errors.append((entry.path, exc))
+                    continue
+                snapshot.files.append(FileEntry(entry.path, entry.name, st.st_size, st.st_mtime_ns, st.st_ino, st.st_dev))
+            # Reverse so subfolders are visited in listing order (same order as os.walk)
+            stack.extend(reversed(subdirs))
+        return snapshot
+
+    def visible_files(self):
+        """Files that aren't hidden/dot-files (this also excludes the organizer's own log)."""
+        return [entry for entry in self.files if not entry.name.startswith(".")]
+
+
+# --- File Transfer ---
+KERNEL_COPY_CHUNK = 1 << 30  # Bytes per copy_file_range/sendfile call
+PARTIAL_SUFFIX = ".organizer-part"  # Transfers write to a hidden sibling, renamed into place once complete
+VERIFY_SAMPLE_BLOCKS = 16  # Blocks compared by sampled move verification (first and last included)
+VERIFY_SAMPLE_SIZE = 64 * 1024
+
+
+def _write_all(fdst, view):
+    while view:
+        view = view[fdst.write(view) :]
+
+
+def _kernel_copy(fsrc, fdst, size):
+    """Copies from the current offsets inside the kernel; returns False if neither call is usable.
+
+    copy_file_range lets the filesystem share extents or copy server-side; sendfile at least
+    skips the round trip through user space. Both advance the file offsets, so after an
+    early failure the caller can continue with a plain read/write loop.
+    """
+    for name in ("copy_file_range", "sendfile"):
+        call = getattr(os, name, None)
+        if call is None:
+            continue
+        copied = 0
+        try:
+            while copied < size:
+                if name == "copy_file_range":
+                    n = call(fsrc.fileno(), fdst.fileno(), min(size - copied, KERNEL_COPY_CHUNK))
+                else:
+                    n = call(fdst.fileno(), fsrc.fileno(), None, min(size - copied, KERNEL_COPY_CHUNK))
+                if n == 0:
+                    break  # Source shrank, or a special file reporting size 0
+                copied += n
+            return True
+        except OSError as exc:
+            if exc.errno not in (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.EPERM):
+                raise  # A real I/O error, not an unsupported call
+    return False
+
+
+def copy_file_data(src, dst, new_hasher=None):
+    """Copies a file's bytes and metadata; returns the hex digest of the data if `new_hasher` is given.
+
+    Without a digest the copy stays in the kernel where the platform allows it; with one, the
+    data is hashed as it streams through a reusable buffer, so the source is read only once.
+    """
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        hasher = new_hasher() if new_hasher else None
+        if hasher is not None or not _kernel_copy(fsrc, fdst, os.fstat(fsrc.fileno()).st_size):
+            view = memoryview(bytearray(HASH_BUFFER_SIZE))
+            while n := fsrc.readinto(view):
+                if hasher is not None:
+                    hasher.update(view[:n])
+                _write_all(fdst, view[:n])
+    shutil.copystat(src, dst)  # Like copy2: preserve timestamps and permissions
+    return hasher.hexdigest() if hasher else None
+
+
+def hash_path(file_path, new_hasher):
+    hasher = new_hasher()
+    view = memoryview(bytearray(HASH_BUFFER_SIZE))
+    with open(file_path, "rb", buffering=0) as f:
+        while n := f.readinto(view):
+            hasher.update(view[:n])
+    return hasher.hexdigest()
+
+
+def sampled_digest(file_path, size):
+    """Digest of VERIFY_SAMPLE_BLOCKS blocks evenly spread over the first `size` bytes (all of a small file)."""
+    hasher = hashlib.blake2b()
+    with open(file_path, "rb", buffering=0) as f:
+        if size <= VERIFY_SAMPLE_BLOCKS * VERIFY_SAMPLE_SIZE:
+            offsets = [0]
+            length = size
+        else:
+            step = (size - VERIFY_SAMPLE_SIZE) / (VERIFY_SAMPLE_BLOCKS - 1)
+            offsets = [int(i * step) for i in range(VERIFY_SAMPLE_BLOCKS)]
+            length = VERIFY_SAMPLE_SIZE
+        for offset in offsets:
+            f.seek(offset)
+            hasher.update(f.read(length))
+    return hasher.hexdigest()
+
+
+def partial_path(dst):
+    """The hidden sibling a transfer to `dst` writes before renaming it into place."""
+    folder, name = os.path.split(dst)
+    return os.path.join(folder, f".{name}{PARTIAL_SUFFIX}")
+
+
+def transfer_file(src, dst, action_type, device_limits=(), verify_algorithm=None, verify_mode="off"):
+    """Copies ('copy') or moves across devices ('move'/'rename') one file.
+
+    The data goes to partial_path(dst) and is renamed to `dst` only once complete, so `dst`
+    never holds a partial copy; on failure the partial file is removed. For a move with
+    `verify_algorithm`, the data is hashed in the same pass that copies it, so the digest
+    describes exactly the bytes written. Before a move removes its source, the copy is
+    checked as `verify_mode` says (see 'verify_cross_device_moves'): "full" compares the
+    copy's size with the source's and checks that the source's size and mtime didn't change
+    during the copy; "readback" also fsyncs the copy and reads it back once against the
+    digest; "sampled" compares the size and a sampled_digest(); "off" checks nothing. A
+    mismatch raises OSError. `device_limits` are the semaphores of the devices involved,
+    acquired in a fixed order so concurrent transfers can't deadlock. Returns (bytes
+    copied, digest or None).
+    """
+    for limit in device_limits:
+        limit.acquire()
+    partial = partial_path(dst)
+    try:
+        is_move = action_type != "copy"
+        new_hasher = HASH_ALGORITHMS[verify_algorithm] if verify_algorithm and is_move else None
+        before = os.stat(src)
+        digest = copy_file_data(src, partial, new_hasher)
+        size = os.path.getsize(partial)
+        if is_move and verify_mode != "off":
+            problem = None
+            if size != before.st_size:
+                problem = "doesn't match the source"
+            elif verify_mode == "sampled":
+                if sampled_digest(partial, size) != sampled_digest(src, size):
+                    problem = "doesn't match the source"
+            else:
+                after = os.stat(src)
+                if (after.st_size, after.st_mtime_ns) != (before.st_size, before.st_mtime_ns):
+                    problem = "changed while it was copied"
+                elif verify_mode == "readback" and digest is not None:
+                    with open(partial, "rb") as f:
+                        os.fsync(f.fileno())
+                    if hash_path(partial, new_hasher) != digest:
+                        problem = "doesn't match the source"
+            if problem:
+                raise OSError(f"Verification failed: '{os.path.basename(dst)}' {problem}; source kept")
+        os.replace(partial, dst)
+        if action_type != "copy":
+            os.remove(src)
+        return size, digest
+    except BaseException:
+        try:
+            os.remove(partial)
+        except OSError:
+            pass
+        raise
+    finally:
+        for limit in reversed(device_limits):
+            limit.release()
+
+
+# --- Destination Namespace ---
+class DestinationNamespace:
+    """In-memory view of the names taken in each destination folder while a plan is built.
+
+    A folder is listed once, the first time it's needed; names the plan assigns are reserved
+    as it goes, so later files in the same batch see them as taken. Conflict renames resume
+    from the last counter used for that name instead of re-testing "name (1)", "name (2)", ...
+    """
+
+    def __init__(self):
+        self._names = {}  # Normalized folder -> set of normalized names
+        self._counters = {}  # (folder, base, ext) -> next " (n)" suffix to try
+
+    def _folder(self, folder):
+        key = os.path.normcase(os.path.normpath(folder))
+        names = self._names.get(key)
+        if names is None:
+            try:
+                with os.scandir(folder) as it:
+                    names = {os.path.normcase(entry.name) for entry in it}
+            except OSError:
+                names = set()  # Not created yet: nothing can conflict on disk
+            self._names[key] = names
+        return key, names
+
+    def exists(self, path):
+        """True if `path` is on disk (as listed) or already reserved by the plan."""
+        return os.path.normcase(os.path.basename(path)) in self._folder(os.path.dirname(path))[1]
+
+    def reserve(self, path):
+        self._folder(os.path.dirname(path))[1].add(os.path.normcase(os.path.basename(path)))
+
+    def reserve_unique(self, path):
+        """Reserves `path`, or the first free "name (n).ext" next to it; returns the reserved path."""
+        folder, name = os.path.split(path)
+        key, names = self._folder(folder)
+        if os.path.normcase(name) not in names:
+            names.add(os.path.normcase(name))
+            return path
+        base, ext = os.path.splitext(name)
+        counter_key = (key, os.path.normcase(base), os.path.normcase(ext))
+        count = self._counters.get(counter_key, 1)
+        while os.path.normcase(candidate := f"{base} ({count}){ext}") in names:
+            count += 1
+        names.add(os.path.normcase(candidate))
+        self._counters[counter_key] = count + 1
+        return os.path.join(folder, candidate)
+
+
+# --- Operation Journal ---
+JOURNAL_FILE_NAME = ".organizer_journal.jsonl"  # Write-ahead record of an organization run in progress
+JOURNAL_BATCH = 256  # Operations whose "begin" records are written out together
+JOURNAL_PLAN_CHUNK = 1024  # Operations per "plan" record
+JOURNAL_SYNC_RECORDS = 4096  # fsync the journal after this many records...
+JOURNAL_SYNC_SECONDS = 1.0  # ...or once this long has passed since the last fsync
+
+
+class OperationJournal:
+    """Append-only JSONL write-ahead log of one organization run, kept in the organized folder.
+
+    start() writes the whole plan and syncs it. Each operation then gets a "begin" record
+    before it runs and a "done" or "failed" record after. Begin records reach the OS before
+    their operations start, JOURNAL_BATCH at a time; done/failed records are buffered and go
+    out with the next batch, since a lost one only means the operation is checked on disk
+    when the run is resumed. fsync runs every JOURNAL_SYNC_RECORDS records or
+    JOURNAL_SYNC_SECONDS, which bounds what a power cut can lose without a flush per file.
+
+    A completed run removes its journal, so one found in a folder is an interrupted run.
+    Like the activity log, the journal switches itself off on a write error (kept in `error`)
+    rather than stopping the run.
+    """
+
+    def __init__(self, folder):
+        self.path = os.path.join(folder, JOURNAL_FILE_NAME)
+        self.error = None
+        self.records = 0
+        self.seconds = 0.0  # Time spent writing and syncing, for the overhead report
+        self._file = None
+        self._settled = []  # Buffered done/failed records
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def start(self, operations):
+        """Starts a new journal with the plan: (op id, destination or original, source, action) tuples."""
+        self._timed(self._start, operations)
+
+    def _start(self, operations):
+        self._file = open(self.path, "w", encoding="utf-8")
+        self._file.write(json.dumps({"op": "run", "time": datetime.now().isoformat(timespec="seconds")}) + "\n")
+        for start in range(0, len(operations), JOURNAL_PLAN_CHUNK):
+            self._file.write(json.dumps({"op": "plan", "operations": operations[start : start + JOURNAL_PLAN_CHUNK]}) + "\n")
+            self.records += 1
+        self.records += 1
+        self._sync()
+
+    def reopen(self):
+        """Continues an existing journal, e.g. when an interrupted run is resumed."""
+        self._timed(self._reopen)
+
+    def _reopen(self):
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps({"op": "resume", "time": datetime.now().isoformat(timespec="seconds")}) + "\n")
+        self.records += 1
+
+    def begin(self, op_ids):
+        """Records that the given operations are about to run, and hands the records to the OS."""
+        if self._file is not None:
+            self._timed(self._write, [f'{{"op": "begin", "id": {op_id}}}\n' for op_id in op_ids], True)
+
+    def begun(self, operations):
+        """Yields `operations` (tuples starting with the op id), writing each batch's begin records first."""
+        for start in range(0, len(operations), JOURNAL_BATCH):
+            batch = operations[start : start + JOURNAL_BATCH]
+            self.begin(operation[0] for operation in batch)
+            yield from batch
+
+    def done(self, op_id):
+        self._settled.append(f'{{"op": "done", "id": {op_id}}}\n')
+        if len(self._settled) >= JOURNAL_SYNC_RECORDS and self._file is not None:
+            self._timed(self._write, [])
+
+    def failed(self, op_id, error):
+        self._settled.append(json.dumps({"op": "failed", "id": op_id, "error": str(error)}) + "\n")
+
+    def finish(self):
+        """Closes and removes the journal once the run's undo log is safely written."""
+        if self._file is not None:
+            self._timed(self._finish)
+
+    def _finish(self):
+        self._file.close()
+        self._file = None
+        os.remove(self.path)
+
+    def close(self):
+        """Writes out what's buffered and closes the journal, leaving it in place to resume from."""
+        if self._file is not None:
+            self._timed(self._write, [], True)
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _write(self, lines, flush=False):
+        lines = self._settled + lines
+        self._settled = []
+        self._file.write("".join(lines))
+        self.records += len(lines)
+        self._unsynced += len(lines)
+        if self._unsynced >= JOURNAL_SYNC_RECORDS or time.monotonic() - self._last_sync >= JOURNAL_SYNC_SECONDS:
+            self._sync()
+        elif flush:
+            self._file.flush()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _timed(self, method, *args):
+        started = time.perf_counter()
+        try:
+            method(*args)
+        except (OSError, ValueError) as exc:  # ValueError: I/O on a file closed by an earlier error
+            self.error = exc
+            if self._file is not None:
+                try:
+                    self._file.close()
+                except OSError:
+                    pass
+            self._file = None
+        finally:
+            self.seconds += time.perf_counter() - started
+
+    @staticmethod
+    def load(folder):
+        """Reads an interrupted run's journal: (plan tuples, begun op ids, {op id: "done"/"failed"}).
+
+        A torn last line (the process died mid-write) is ignored.
+        """
+        plan, begun, settled = [], set(), {}
+        with open(os.path.join(folder, JOURNAL_FILE_NAME), "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                op = record.get("op")
+                if op == "plan":
+                    plan.extend(tuple(operation) for operation in record["operations"])
+                elif op == "begin":
+                    begun.add(record["id"])
+                elif op in ("done", "failed"):
+                    settled[record["id"]] = op
+        return plan, begun, settled
+
+
+# --- Persistent File Index ---
+class FileIndex:
+    """SQLite index of per-file results keyed by (path, size, mtime_ns, inode).
+
+    Each row stores the EXIF/doc metadata, content-keyword outcomes and rule outcomes of one file,
+    so a re-run only re-evaluates files that changed since the last run. Some of those results
+    depend on settings beyond the rules themselves (e.g. which extensions count as images get
+    EXIF read), so `settings_key` fingerprints them: a different key empties the index.
+    """
+
+    SCHEMA_VERSION = 1
+    BATCH_SIZE = 1000
+
+    def __init__(self, folder, settings_key=""):
+        self.folder = folder
+        self.conn = sqlite3.connect(os.path.join(folder, INDEX_FILE_NAME))
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS files")
+            self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS files ("
+            "path TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, inode INTEGER, data TEXT)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        row = self.conn.execute("SELECT value FROM meta WHERE key = 'settings'").fetchone()
+        if row is None or row[0] != settings_key:
+            self.conn.execute("DELETE FROM files")
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('settings', ?)", (settings_key,))
+        self.conn.commit()
+        self._loaded = {}  # path -> serialized data as read, to skip rewriting unchanged rows
+        self._pending = []
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, entry):
+        """Returns the cached data for an unchanged file, or an empty dict."""
+        if self.conn is None:
+            return {}
+        row = self.conn.execute("SELECT size, mtime_ns, inode, data FROM files WHERE path = ?", (entry.path,)).fetchone()
+        if row and (row[0], row[1], row[2]) == (entry.size, entry.mtime_ns, entry.inode):
+            try:
+                data = json.loads(row[3])
+            except (TypeError, ValueError):
+                data = None
+            if isinstance(data, dict):
+                self.hits += 1
+                self._loaded[entry.path] = row[3]
+                return data
+        self.misses += 1
+        return {}
+
+    def store(self, entry, file_cache):
+        """Queues the cached results of a file for writing (only if they changed)."""
+        if self.conn is None:
+            return
+        data = {}
+        if "exif" in file_cache:
+            data["exif"] = self._json_safe_exif(file_cache["exif"])
+        for key in ("doc_meta", "content", "rules", "pdf_scan"):
+            if key in file_cache:
+                data[key] = file_cache[key]
+        serialized = json.dumps(data, sort_keys=True)
+        if self._loaded.pop(entry.path, None) == serialized:
+            return
+        self._pending.append((entry.path, entry.size, entry.mtime_ns, entry.inode, serialized))
+        if len(self._pending) >= self.BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        if self._pending and self.conn is not None:
+            self.conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?)", self._pending)
+            self.conn.commit()
+            self._pending = []
+
+    def prune(self, seen_paths, recursive):
+        """Drops rows for files that no longer exist (only within the scanned part of the tree)."""
+        if self.conn is None:
+            return
+        stale = []
+        root = os.path.normpath(self.folder)
+        for (path,) in self.conn.execute("SELECT path FROM files"):
+            if path in seen_paths:
+                continue
+            if recursive or os.path.normpath(os.path.dirname(path)) == root:
+                stale.append((path,))
+        if stale:
+            self.conn.executemany("DELETE FROM files WHERE path = ?", stale)
+            self.conn.commit()
+
+    def disable(self):
+        """Stops using the index for the rest of the run (after a database error)."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        self._pending = []
+
+    def close(self):
+        if self.conn is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self.disable()
+
+    @staticmethod
+    def _json_safe_exif(exif):
+        """Keeps the indexed tags and converts PIL values (IFDRational, bytes) to JSON types."""
+        safe = {}
+        for tag in INDEXED_EXIF_TAGS:
+            val = exif.get(tag)
+            if val is None:
+                continue
+            if isinstance(val, bytes):
+                val = val.decode("utf-8", errors="ignore").strip()
+            elif isinstance(val, numbers.Number) and not isinstance(val, (int, float)):
+                val = float(val)
+            elif not isinstance(val, (str, int, float)):
+                val = str(val)
+            safe[tag] = val
+        return safe
+
+
+class HashCache:
+    """SQLite cache of file digests keyed by (dev, inode, algorithm) and validated by (size, mtime_ns).
+
+    Each row holds the head/tail ("partial") and full digest of one file, so re-scans only read
+    files that are new or changed. Rows not used for the longest time are evicted beyond
+    `max_entries`.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, db_path, algorithm, max_entries):
+        self.algorithm = algorithm
+        self.max_entries = max_entries
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != self.SCHEMA_VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS hashes")
+            self.conn.execute(f"PRAGMA user_version={self.SCHEMA_VERSION}")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS hashes ("
+            "dev INTEGER, inode INTEGER, algorithm TEXT, size INTEGER, mtime_ns INTEGER, "
+            "partial TEXT, full TEXT, last_used REAL, PRIMARY KEY (dev, inode, algorithm))"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS hashes_last_used ON hashes (last_used)")
+        self.conn.commit()
+        self._rows = {}  # Entry -> [partial, full] for entries looked up or hashed this run
+        self.hits = 0
+
+    @staticmethod
+    def cacheable(entry):
+        return entry.inode != 0  # Windows scandir doesn't report inodes
+
+    def lookup(self, entry, kind):
+        """Cached 'partial' or 'full' digest of an unchanged file, or None."""
+        if self.conn is None or not self.cacheable(entry):
+            return None
+        row = self._rows.get(entry)
+        if row is None:
+            found = self.conn.execute(
+                "SELECT size, mtime_ns, partial, full FROM hashes WHERE dev = ? AND inode = ? AND algorithm = ?",
+                (entry.dev, entry.inode, self.algorithm),
+            ).fetchone()
+            row = [found[2], found[3]] if found and (found[0], found[1]) == (entry.size, entry.mtime_ns) else [None, None]
+            self._rows[entry] = row
+        digest = row[0 if kind == "partial" else 1]
+        if digest is not None:
+            self.hits += 1
+        return digest
+
+    def store(self, entry, kind, digest):
+        if self.cacheable(entry):
+            self._rows.setdefault(entry, [None, None])[0 if kind == "partial" else 1] = digest
+
+    def flush(self):
+        """Writes every digest used this run (refreshing its last_used), then evicts beyond max_entries."""
+        if self.conn is None:
+            return
+        now = time.time()
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (entry.dev, entry.inode, self.algorithm, entry.size, entry.mtime_ns, partial, full, now)
+                for entry, (partial, full) in self._rows.items()
+                if partial is not None or full is not None
+            ],
+        )
+        excess = self.conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.conn.execute(
+                "DELETE FROM hashes WHERE rowid IN (SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)", (excess,)
+            )
+        self.conn.commit()
+        self._rows = {}
+
+    def disable(self):
+        """Stops using the cache for the rest of the scan (after a database error)."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        self._rows = {}
+
+    def close(self):
+        if self.conn is None:
+            return
+        try:
+            self.flush()
+        finally:
+            self.disable()
+
+
+# --- Compiled Rule Engine ---
+# Cost classes used to order the AND-conditions of a rule (cheapest first)
+COST_CHEAP = 0  # Name, folder, size, date: answered from the snapshot entry
+COST_MEDIUM = 1  # EXIF / PDF / DOCX metadata: opens the file
+COST_EXPENSIVE = 2  # Content: extracts and scans text
+
+
+class FileContext:
+    """Per-file values shared by every compiled condition, computed once per file."""
+
+    __slots__ = ("path", "entry", "cache", "name", "name_lower", "folder", "folder_lower", "size_mb", "skipped", "_age_days")
+
+    def __init__(self, path, entry, cache):
+        self.path = path
+        self.entry = entry
+        self.cache = cache  # The file's slot in Worker.file_metadata_cache
+        self.name = os.path.basename(path)
+        self.name_lower = self.name.lower()
+        self.folder = os.path.basename(os.path.dirname(path))
+        self.folder_lower = self.folder.lower()
+        self.size_mb = entry.size / (1024 * 1024) if entry else 0.0
+        self.skipped = set()  # Cache slots of costly conditions the planner didn't need to evaluate
+        self._age_days = None
+
+    @property
+    def age_days(self):
+        if self._age_days is None:
+            self._age_days = (datetime.now() - datetime.fromtimestamp(self.entry.mtime)).days
+        return self._age_days
+
+
+class ConditionMatcher:
+    """One rule condition compiled once: lower-cased needle, precompiled regex, parsed threshold."""
+
+    TEXT_TESTS = {
+        "contains": lambda needle, text: needle in text,
+        "startswith": lambda needle, text: text.startswith(needle),
+        "endswith": lambda needle, text: text.endswith(needle),
+        "equals": lambda needle, text: text == needle,
+    }
+    NUMBER_TESTS = {
+        "greater_than": lambda value, threshold: value > threshold,
+        "less_than": lambda value, threshold: value < threshold,
+        "equals": lambda value, threshold: value == threshold,
+    }
+    EXIF_KEYS = {"camera model": "Model", "lens model": "LensModel", "artist": "Artist"}
+    COSTS = {
+        "camera model": COST_MEDIUM,
+        "lens model": COST_MEDIUM,
+        "artist": COST_MEDIUM,
+        "f-stop": COST_MEDIUM,
+        "pdf author": COST_MEDIUM,
+        "pdf title": COST_MEDIUM,
+        "docx author": COST_MEDIUM,
+        "docx title": COST_MEDIUM,
+        "content": COST_EXPENSIVE,
+    }
+
+    def __init__(self, cond, position=0):
+        self.position = position  # Index in the rule as the user wrote it
+        self.cond_type = str(cond.get("type", "")).lower()
+        self.value = cond.get("value", "")
+        self.matcher = str(cond.get("matcher", "contains")).lower()
+        self.needle = str(self.value).lower()
+        self.regex = None
+        self.threshold = None
+        self.error = None
+        compiler = self.DISPATCH.get(self.cond_type)
+        try:
+            self.test = compiler(self) if compiler else self._never
+        except (re.error, ValueError, TypeError) as exc:
+            # Invalid conditions were always skipped (treated as passing); keep that, but report it once
+            self.error = exc
+            self.test = self._always
+        self.cost = COST_CHEAP if self.error else self.COSTS.get(self.cond_type, COST_CHEAP)
+
+    def cache_slot(self):
+        """Key of the per-file cache entry this condition fills, for costly conditions."""
+        if self.cost == COST_EXPENSIVE:
+            return ("content", self.needle)
+        if self.cost == COST_MEDIUM:
+            return ("exif",) if self.cond_type in self.EXIF_KEYS or self.cond_type == "f-stop" else ("doc_meta",)
+        return None
+
+    @staticmethod
+    def _never(worker, ctx):
+        return False
+
+    @staticmethod
+    def _always(worker, ctx):
+        return True
+
+    def _compile_path_text(self, raw_attr, lower_attr):
+        if self.matcher == "regex":
+            self.regex = re.compile(str(self.value), re.IGNORECASE)
+            search = self.regex.search
+            return lambda worker, ctx: search(getattr(ctx, raw_attr)) is not None
+        text_test = self.TEXT_TESTS.get(self.matcher)
+        if not text_test:
+            return self._never
+        needle = self.needle
+        return lambda worker, ctx: text_test(needle, getattr(ctx, lower_attr))
+
+    def _compile_filename(self):
+        return self._compile_path_text("name", "name_lower")
+
+    def _compile_folder_name(self):
+        return self._compile_path_text("folder", "folder_lower")
+
+    def _compile_content(self):
+        needle = self.needle
+        return lambda worker, ctx: worker.content_matches(ctx, needle)
+
+    def _compile_filesize(self):
+        self.threshold = float(self.value)
+        if self.matcher not in ("greater_than", "less_than"):
+            return self._never
+        number_test = self.NUMBER_TESTS[self.matcher]
+        threshold = self.threshold
+        return lambda worker, ctx: number_test(ctx.size_mb, threshold)
+
+    def _compile_date_modified(self):
+        self.threshold = int(self.value)
+        threshold = self.threshold
+        if self.matcher == "older_than":
+            return lambda worker, ctx: ctx.age_days > threshold
+        if self.matcher == "newer_than":
+            return lambda worker, ctx: ctx.age_days < threshold
+        return self._never
+
+    def _compile_meta_text(self, fetch, key):
+        if self.matcher not in ("contains", "equals"):
+            text_test = None
+        else:
+            text_test = self.TEXT_TESTS[self.matcher]
+        needle = self.needle
+
+        def test(worker, ctx):
+            meta = fetch(worker, ctx)
+            if not meta:
+                return True  # Files without metadata don't fail metadata conditions
+            return bool(text_test) and text_test(needle, str(meta.get(key, "")).lower())
+
+        return test
+
+    def _compile_exif_text(self):
+        return self._compile_meta_text(lambda worker, ctx: worker.cached_exif(ctx), self.EXIF_KEYS[self.cond_type])
+
+    def _compile_doc_meta(self):
+        key = "author" if "author" in self.cond_type else "title"
+        return self._compile_meta_text(lambda worker, ctx: worker.cached_doc_meta(ctx), key)
+
+    def _compile_fstop(self):
+        self.threshold = float(self.value)
+        number_test = self.NUMBER_TESTS.get(self.matcher)
+        threshold = self.threshold
+
+        def test(worker, ctx):
+            exif = worker.cached_exif(ctx)
+            if not exif or "FNumber" not in exif:
+                return True
+            return bool(number_test) and number_test(exif["FNumber"], threshold)
+
+        return test
+
+    DISPATCH = {
+        "filename": _compile_filename,
+        "original folder name": _compile_folder_name,
+        "content": _compile_content,
+        "filesize_mb": _compile_filesize,
+        "date_modified_days": _compile_date_modified,
+        "camera model": _compile_exif_text,
+        "lens model": _compile_exif_text,
+        "artist": _compile_exif_text,
+        "f-stop": _compile_fstop,
+        "pdf author": _compile_doc_meta,
+        "pdf title": _compile_doc_meta,
+        "docx author": _compile_doc_meta,
+        "docx title": _compile_doc_meta,
+    }
+
+
+class KeywordScanner:
+    """Finds many keywords in a single pass over extracted text.
+
+    The keywords are compiled into a trie-shaped regex: an Aho-Corasick-style automaton that runs in
+    the C regex engine (a per-character Python loop would be far slower than the text extraction it
+    saves). A lookahead reports a match at every position, so overlapping keywords are all found.
+    """
+
+    def __init__(self, keywords):
+        self.keywords = frozenset(keywords)
+        self._regex = re.compile(f"(?=({self._trie_pattern(self.keywords)}))") if self.keywords else None
+        self._prefix_hits = {}  # Matched text -> keywords that are prefixes of it
+
+    @staticmethod
+    def _trie_pattern(keywords):
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for char in keyword:
+                node = node.setdefault(char, {})
+            node[""] = True  # End-of-keyword marker
+
+        def build(node):
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ""
+            alternation = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+            # Greedy optional tail: the longest keyword at a position wins, its prefixes are derived
+            return f"(?:{alternation})?" if "" in node else alternation
+
+        return build(trie)
+
+    def scan(self, segments, found):
+        """Adds the keywords found in the (lower-cased) segments to `found`, stopping once all are found."""
+        if not self._regex:
+            return found
+        for segment in segments:
+            for match in self._regex.finditer(segment.lower()):
+                text = match.group(1)
+                hits = self._prefix_hits.get(text)
+                if hits is None:
+                    hits = self._prefix_hits[text] = frozenset(k for k in self.keywords if text.startswith(k))
+                found |= hits
+                if len(found) == len(self.keywords):
+                    return found
+        return found
+
+
+class CompiledRule:
+    """A user rule compiled into condition matchers plus its parsed action."""
+
+    def __init__(self, rule):
+        self.name = rule.get("name", "")
+        raw_conditions = rule.get("conditions") or []
+        self.has_conditions = bool(raw_conditions)
+        # Conditions without a type or value were always skipped
+        conditions = [
+            ConditionMatcher(cond, position) for position, cond in enumerate(raw_conditions) if cond.get("type") and cond.get("value")
+        ]
+        # All conditions must pass and have no side effects, so evaluating the cheap ones first
+        # gives the same result while letting them reject a file before any costly I/O
+        self.conditions = sorted(conditions, key=lambda cond: cond.cost)
+        self.action_type = str(rule.get("action_type", "move")).lower()
+        self.action_value = rule.get("action_value", "")
+        self.has_content = any(cond.cond_type == "content" for cond in self.conditions)
+        # Key for caching this rule's outcome in the file index; None when it depends on the current date
+        if any(cond.cond_type == "date_modified_days" for cond in self.conditions):
+            self.cache_key = None
+        else:
+            self.cache_key = hashlib.sha1(json.dumps(raw_conditions, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+    def warnings(self):
+        return [
+            f"Rule '{self.name}': invalid {cond.cond_type} condition '{cond.value}' is ignored ({cond.error})"
+            for cond in self.conditions
+            if cond.error
+        ]
+
+
+# --- Metadata Extraction ---
+# Module-level so the same code runs on the Worker thread and in MetadataPrefetcher processes
+CONTENT_EXTENSIONS = (".txt", ".pdf", ".docx")
+DOC_META_EXTENSIONS = (".pdf", ".docx")
+PREFETCH_MIN_FILES = 200  # Smaller previews aren't worth starting worker processes for
+# DOCX is a zip package; these parts are read directly instead of building a python-docx object model
+DOCX_CORE_PROPS = "docProps/core.xml"
+DOCX_DOCUMENT = "word/document.xml"
+DOCX_PARAGRAPH_BUDGET = 10  # Body paragraphs scanned by content rules
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+DC_NS = "{http://purl.org/dc/elements/1.1/}"
+
+
+# Tag ids of INDEXED_EXIF_TAGS, the only tags classification looks at
+EXIF_TAG_IDS = {
+    0x010E: "ImageDescription",
+    0x0110: "Model",
+    0x0132: "DateTime",
+    0x013B: "Artist",
+    0x829D: "FNumber",  # Exif sub-IFD
+    0x9003: "DateTimeOriginal",  # Exif sub-IFD
+    0xA434: "LensModel",  # Exif sub-IFD
+}
+EXIF_SUBIFD_POINTER = 0x8769
+EXIF_HEADER_BYTES = 64 * 1024
+TIFF_MAGICS = (b"II*\x00", b"MM\x00*")
+# Byte sizes of the TIFF field types we decode: ASCII, SHORT, LONG, RATIONAL
+TIFF_TYPE_SIZES = {2: 1, 3: 2, 4: 4, 5: 8}
+
+
+def read_exif_data(file_path):
+    """Extracts the classification EXIF tags from an image file.
+
+    Tries a header-only parse of the first 64 KB and falls back to PIL when the
+    EXIF block isn't there or can't be parsed.
+    """
+    try:
+        exif = _read_exif_header(file_path)
+    except (OSError, ValueError, IndexError, struct.error):
+        exif = None
+    if exif is None:
+        exif = _read_exif_pil(file_path)
+    return exif
+
+
+def _find_tiff_header(data):
+    """Offset of the EXIF TIFF header in `data`, -1 if the file has no EXIF, None if unknown."""
+    if data[:4] in TIFF_MAGICS:
+        return 0  # TIFF and TIFF-based RAW formats
+    if data[:2] == b"\xff\xd8":
+        # JPEG: walk the marker segments up to APP1 "Exif"
+        pos = 2
+        while pos + 4 <= len(data):
+            if data[pos] != 0xFF:
+                return None
+            marker = data[pos + 1]
+            if marker == 0xFF:  # Fill byte
+                pos += 1
+                continue
+            if marker in (0xDA, 0xD9):  # Start of scan / end of image: there is no EXIF
+                return -1
+            length = int.from_bytes(data[pos + 2 : pos + 4], "big")
+            if marker == 0xE1 and data[pos + 4 : pos + 10] == b"Exif\x00\x00":
+                return pos + 10
+            pos += 2 + length
+        return None
+    # HEIC and other containers store "Exif\0\0" followed by a TIFF header
+    idx = data.find(b"Exif\x00\x00")
+    while idx != -1:
+        if data[idx + 6 : idx + 10] in TIFF_MAGICS:
+            return idx + 6
+        idx = data.find(b"Exif\x00\x00", idx + 1)
+    return None
+
+
+def _read_exif_header(file_path):
+    """Parses IFD0 and the Exif sub-IFD of the first EXIF_HEADER_BYTES; None if that isn't enough."""
+    with open(file_path, "rb") as f:
+        data = f.read(EXIF_HEADER_BYTES)
+    base = _find_tiff_header(data)
+    if base is None:
+        return None
+    if base < 0:
+        return {}
+    endian = "<" if data[base : base + 2] == b"II" else ">"
+    exif = {}
+    sub_ifd = _parse_exif_ifd(data, base, struct.unpack_from(endian + "I", data, base + 4)[0], endian, exif)
+    if sub_ifd:
+        _parse_exif_ifd(data, base, sub_ifd, endian, exif)
+    return exif
+
+
+def _parse_exif_ifd(data, base, offset, endian, exif):
+    """Decodes the wanted tags of one IFD into `exif`; returns the Exif sub-IFD offset if present."""
+    sub_ifd = None
+    start = base + offset
+    count = struct.unpack_from(endian + "H", data, start)[0]
+    for i in range(count):
+        tag, field_type, n, raw = struct.unpack_from(endian + "HHI4s", data, start + 2 + 12 * i)
+        if tag == EXIF_SUBIFD_POINTER:
+            sub_ifd = struct.unpack(endian + "I", raw)[0]
+            continue
+        name = EXIF_TAG_IDS.get(tag)
+        size = TIFF_TYPE_SIZES.get(field_type)
+        if not name or not size:
+            continue  # Tags nobody asked for are never decoded
+        length = size * n
+        if length <= 4:
+            value = raw[:length]
+        else:
+            value_offset = base + struct.unpack(endian + "I", raw)[0]
+            if value_offset + length > len(data):
+                raise ValueError("EXIF value beyond header buffer")
+            value = data[value_offset : value_offset + length]
+        if field_type == 2:
+            exif[name] = value.split(b"\x00", 1)[0].decode("utf-8", errors="ignore").strip()
+        elif field_type == 5:
+            numerator, denominator = struct.unpack(endian + "II", value[:8])
+            if denominator:
+                exif[name] = numerator / denominator
+        else:
+            exif[name] = struct.unpack(endian + ("H" if field_type == 3 else "I"), value[:size])[0]
+    return sub_ifd
+
+
+def _read_exif_pil(file_path):
+    """PIL fallback: decodes only the wanted tags."""
+    try:
+        with Image.open(file_path) as img:
+            exif_data = img._getexif()
+            if not exif_data:
+                return {}
+
+            exif = {}
+            for tag_id, tag in EXIF_TAG_IDS.items():
+                if tag_id not in exif_data:
+                    continue
+                val = exif_data[tag_id]
+                if isinstance(val, bytes):
+                    val = val.decode("utf-8", errors="ignore")
+                if isinstance(val, str):
+                    val = val.strip()
+                exif[tag] = val
+
+            # Special handling for FNumber (PIL returns IFDRational or a tuple)
+            if "FNumber" in exif:
+                f_num = exif["FNumber"]
+                if isinstance(f_num, tuple) and len(f_num) == 2 and f_num[1] != 0:
+                    exif["FNumber"] = float(f_num[0] / f_num[1])
+                elif isinstance(f_num, numbers.Number):
+                    exif["FNumber"] = float(f_num)
+
+            return exif
+    except (UnidentifiedImageError, IOError, AttributeError, OSError, TypeError, ZeroDivisionError):
+        # Catch more errors as EXIF data can be corrupt
+        return {}
+
+
+class PdfAnalysis:
+    """A PDF opened once and shared by the metadata and content checks of that file.
+
+    Metadata, encryption status and the text of the first `max_pages` pages are read lazily
+    and memoized. PyPDF2 only parses the cross-reference table and the pages asked for, so
+    large PDFs can be classified by their first pages; files over `max_bytes` (0 = no limit)
+    skip text extraction. Call close() (or use it as a context manager) when done.
+    """
+
+    def __init__(self, file_path, max_pages=None, max_bytes=None, size=None):
+        self.file_path = file_path
+        self.max_pages = PERFORMANCE_DEFAULTS["pdf_scan_pages"] if max_pages is None else max_pages
+        if max_bytes is None:
+            max_bytes = int(PERFORMANCE_DEFAULTS["pdf_scan_max_mb"] * 1024 * 1024)
+        self.max_bytes = max_bytes
+        self.size = size
+        self._file = None
+        self._reader = None
+        self._metadata = None
+        self._page_texts = []
+        self._pages_done = False
+
+    @property
+    def reader(self):
+        if self._reader is None:
+            self._file = open(self.file_path, "rb")
+            # The file stays open: PyPDF2 reads objects from it on demand
+            self._reader = PyPDF2.PdfReader(self._file, strict=False)
+        return self._reader
+
+    @property
+    def is_encrypted(self):
+        return self.reader.is_encrypted
+
+    def metadata(self):
+        """Author/title, or {} for encrypted or unreadable files."""
+        if self._metadata is None:
+            try:
+                if self.is_encrypted:
+                    self._metadata = {}
+                else:
+                    info = self.reader.metadata
+                    self._metadata = {"author": getattr(info, "author", "") or "", "title": getattr(info, "title", "") or ""}
+            except Exception:
+                self._metadata = {}
+        return self._metadata
+
+    def iter_page_texts(self):
+        """Yields the text of the first `max_pages` pages, extracting each page at most once."""
+        yield from list(self._page_texts)
+        if self._pages_done:
+            return
+        if self.size is None:
+            self.size = os.path.getsize(self.file_path)
+        if (self.max_bytes and self.size > self.max_bytes) or self.is_encrypted:
+            self._pages_done = True
+            return
+        pages = self.reader.pages
+        for i in range(len(self._page_texts), min(len(pages), self.max_pages)):
+            text = pages[i].extract_text() or ""
+            self._page_texts.append(text)
+            yield text
+        self._pages_done = True
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._reader = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def read_pdf_metadata(file_path, pdf=None):
+    """Extracts metadata from a PDF file, reusing the file's PdfAnalysis when one is given."""
+    if not PYPDF2_AVAILABLE or not file_path.lower().endswith(".pdf"):
+        return {}
+    if pdf is not None:
+        return pdf.metadata()
+    with PdfAnalysis(file_path) as pdf:
+        return pdf.metadata()
+
+
+def read_docx_metadata(file_path):
+    """Extracts metadata from a DOCX file by reading docProps/core.xml straight from the zip package."""
+    if not file_path.lower().endswith(".docx"):
+        return {}
+    try:
+        with zipfile.ZipFile(file_path) as package, package.open(DOCX_CORE_PROPS) as f:
+            props = ElementTree.parse(f).getroot()
+        return {"author": props.findtext(DC_NS + "creator") or "", "title": props.findtext(DC_NS + "title") or ""}
+    except Exception:
+        return {}
+
+
+def iter_docx_paragraphs(file_path, budget=DOCX_PARAGRAPH_BUDGET):
+    """Streams the text of body paragraphs from word/document.xml with an incremental parser.
+
+    Only the first `budget` paragraphs are parsed; the caller can also stop early (e.g. at the
+    first keyword hit), so embedded images and the rest of the document are never read.
+    """
+    with zipfile.ZipFile(file_path) as package, package.open(DOCX_DOCUMENT) as f:
+        parser = ElementTree.XMLPullParser(events=("start", "end"))
+        depth = 0
+        body_depth = None
+        parts = None  # Text runs of the current body paragraph
+        emitted = 0
+        while emitted < budget:
+            chunk = f.read(64 * 1024)
+            if not chunk:
+                break
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == "start":
+                    depth += 1
+                    if elem.tag == W_NS + "body":
+                        body_depth = depth
+                    elif elem.tag == W_NS + "p" and body_depth is not None and depth == body_depth + 1:
+                        parts = []
+                    continue
+
+                if parts is not None:
+                    if elem.tag == W_NS + "t":
+                        parts.append(elem.text or "")
+                    elif elem.tag == W_NS + "tab":
+                        parts.append("\t")
+                    elif elem.tag in (W_NS + "br", W_NS + "cr"):
+                        parts.append("\n")
+                    elif elem.tag == W_NS + "p" and depth == body_depth + 1:
+                        yield "".join(parts)
+                        parts = None
+                        emitted += 1
+                        if emitted >= budget:
+                            return
+                depth -= 1
+                elem.clear()  # Keep memory flat on large documents
+
+
+def iter_content_text(file_path, pdf=None, text_chars=1024 * 1024, docx_paragraphs=DOCX_PARAGRAPH_BUDGET):
+    """Yields the text segments content rules look at (pages, paragraphs, or the head of a text file).
+
+    The defaults are the content-rule budgets; PDF pages are limited by `pdf`'s own budget.
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext == ".txt":
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
+            yield f.read(text_chars)
+    elif PYPDF2_AVAILABLE and ext == ".pdf":
+        if pdf is not None:
+            yield from pdf.iter_page_texts()
+        else:
+            with PdfAnalysis(file_path) as pdf:
+                yield from pdf.iter_page_texts()
+    elif ext == ".docx":
+        yield from iter_docx_paragraphs(file_path, docx_paragraphs)
+
+
+def scan_file_content(file_path, scanner, pdf=None):
+    """Extracts the file's text once; returns (keywords found, error or None)."""
+    found = set()
+    segments = iter_content_text(file_path, pdf)
+    try:
+        scanner.scan(segments, found)
+    except Exception as exc:
+        return found, exc  # Keywords seen before the error still count
+    finally:
+        segments.close()
+    return found, None
+
+
+_prefetch_scanner = None  # Per-process KeywordScanner, set by _init_prefetch_process
+_prefetch_pdf_budget = {}
+
+
+def _init_prefetch_process(keywords, pdf_budget):
+    global _prefetch_scanner, _prefetch_pdf_budget
+    _prefetch_scanner = KeywordScanner(keywords)
+    _prefetch_pdf_budget = pdf_budget
+
+
+def extract_file_metadata(job):
+    """Runs in a worker process: extracts what rule evaluation will ask for, as file-cache entries."""
+    file_path, want_exif, want_doc_meta, want_content = job
+    result = {}
+    if want_exif:
+        result["exif"] = read_exif_data(file_path)
+    is_pdf = file_path.lower().endswith(".pdf")
+    # One PdfAnalysis serves both the metadata and the content check
+    with PdfAnalysis(file_path, **_prefetch_pdf_budget) if is_pdf and PYPDF2_AVAILABLE else nullcontext() as pdf:
+        if want_doc_meta:
+            result["doc_meta"] = read_pdf_metadata(file_path, pdf) if is_pdf else read_docx_metadata(file_path)
+        if want_content:
+            found, error = scan_file_content(file_path, _prefetch_scanner, pdf)
+            result["content"] = {keyword: keyword in found for keyword in _prefetch_scanner.keywords}
+            if error:
+                result["warning"] = f"Scan content error {os.path.basename(file_path)}: {error}"
+    return result
+
+
+def process_pool_context():
+    """Start method for worker process pools: never a plain fork of this process.
+
+    The Worker starts pools from a QThread while Qt, SQLite and logging may hold locks in
+    other threads; a forked child inherits those locks held and can deadlock. forkserver
+    forks from a clean single-threaded server; where it's unavailable (Windows), spawn is used.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class MetadataPrefetcher:
+    """Bounded process pool that extracts metadata ahead of rule evaluation.
+
+    At most `workers * 4` jobs are in flight; results are yielded in submission order so the
+    Worker thread can keep evaluating rules file by file while the pool parses upcoming files.
+    """
+
+    def __init__(self, workers, keywords, pdf_budget):
+        self.window = workers * 4
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=process_pool_context(),
+            initializer=_init_prefetch_process,
+            initargs=(tuple(keywords), pdf_budget),
+        )
+
+    def run(self, items):
+        """Takes (item, job or None) pairs and yields (item, result or None) in order."""
+        pending = deque()
+        for item, job in items:
+            pending.append((item, self.executor.submit(extract_file_metadata, job) if job else None))
+            if len(pending) >= self.window:
+                yield self._complete(*pending.popleft())
+        while pending:
+            yield self._complete(*pending.popleft())
+
+    @staticmethod
+    def _complete(item, future):
+        if future is None:
+            return item, None
+        try:
+            return item, future.result()
+        except Exception:
+            return item, None  # e.g. a crashed worker process; the Worker extracts it lazily instead
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# --- Duplicate Detection ---
+DUPLICATE_EDGE_BYTES = 64 * 1024  # Head and tail bytes hashed to split same-size candidates
+HASH_BUFFER_SIZE = 1024 * 1024  # hashlib releases the GIL while hashing buffers this large
+HASH_ALGORITHMS = {"md5": hashlib.md5, "blake2b": hashlib.blake2b, "sha256": hashlib.sha256}
+PROGRESS_INTERVAL = 0.1  # Seconds between progress_updated emits in tight loops
+DHASH_SIZE = 8  # dHash grid: 8x8 gradient bits = 64-bit hash
+PERCEPTUAL_HASH_NAME = "dhash"  # Hash cache 'algorithm' under which image dHashes are kept
+DUPLICATE_MODE_EXACT = "Exact"
+DUPLICATE_MODE_IMAGES = "Similar Images"
+DUPLICATE_MODE_DOCUMENTS = "Similar Documents"
+DUPLICATE_MODES = (DUPLICATE_MODE_EXACT, DUPLICATE_MODE_IMAGES, DUPLICATE_MODE_DOCUMENTS)
+SHINGLE_WORDS = 5  # Words per shingle for document similarity
+MINHASH_BINS = 128  # MinHash signature length
+MINHASH_EMPTY = (1 << 60) - 1  # Value of a bin no shingle fell into (shingle values are 57 bits)
+FICLONE = 0x40049409  # Linux ioctl: share the source file's extents with the destination
+
+
+class HashEngine:
+    """Hashes files on a thread pool with one reusable read buffer per thread.
+
+    File reads and hashlib updates on large buffers both release the GIL, so several threads
+    keep fast disks busy. Results are yielded as they complete, at most `workers * 4` in flight.
+    With `processes=True` the pool is a process pool, for signatures computed in Python.
+    """
+
+    def __init__(self, algorithm="md5", workers=1, processes=False):
+        self.algorithm = algorithm
+        self.new_hasher = HASH_ALGORITHMS[algorithm]
+        self.workers = workers
+        self._local = threading.local()
+        self.executor = None
+        if workers > 1:
+            # Processes for pure-Python work that holds the GIL (func must then be picklable)
+            if processes:
+                self.executor = ProcessPoolExecutor(max_workers=workers, mp_context=process_pool_context())
+            else:
+                self.executor = ThreadPoolExecutor(max_workers=workers)
+
+    def _buffer(self):
+        view = getattr(self._local, "view", None)
+        if view is None:
+            view = self._local.view = memoryview(bytearray(HASH_BUFFER_SIZE))
+        return view
+
+    def full(self, file_path):
+        """Hex digest of the whole file."""
+        hasher = self.new_hasher()
+        view = self._buffer()
+        with open(file_path, "rb", buffering=0) as f:
+            while n := f.readinto(view):
+                hasher.update(view[:n])
+        return hasher.hexdigest()
+
+    def edges(self, file_path, size):
+        """Hex digest of the first and last DUPLICATE_EDGE_BYTES of a file (of `size` bytes)."""
+        hasher = self.new_hasher()
+        view = self._buffer()[:DUPLICATE_EDGE_BYTES]
+        with open(file_path, "rb", buffering=0) as f:
+            hasher.update(view[: f.readinto(view)])
+            if size > DUPLICATE_EDGE_BYTES:
+                f.seek(max(DUPLICATE_EDGE_BYTES, size - DUPLICATE_EDGE_BYTES))
+                hasher.update(view[: f.readinto(view)])
+        return hasher.hexdigest()
+
+    def digest(self, kind, entry):
+        """The 'partial' (head/tail) or 'full' digest of a FileEntry."""
+        return self.edges(entry.path, entry.size) if kind == "partial" else self.full(entry.path)
+
+    def run(self, func, entries):
+        """Yields (entry, digest, error) for each entry, calling func(entry) on the pool."""
+        if self.executor is None:
+            for entry in entries:
+                yield (entry, *self._call(func, entry))
+            return
+        pending = {}
+        for entry in entries:
+            try:
+                future = self.executor.submit(self._call, func, entry)
+            except BrokenExecutor:
+                yield (entry, *self._call(func, entry))  # A worker process died: finish on this thread
+                continue
+            pending[future] = entry
+            if len(pending) >= self.workers * 4:
+                done, _not_done = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield (pending.pop(future), *self._outcome(future))
+        for future in as_completed(pending):
+            yield (pending[future], *self._outcome(future))
+
+    @staticmethod
+    def _call(func, entry):
+        try:
+            return func(entry), None
+        except Exception as exc:  # Any failure is that file's; the scan goes on without it
+            return None, exc
+
+    @staticmethod
+    def _outcome(future):
+        try:
+            return future.result()
+        except Exception as exc:  # e.g. BrokenProcessPool when a worker process crashed on the file
+            return None, exc
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def image_dhash(file_path):
+    """64-bit difference hash of an image, as 16 hex digits.
+
+    JPEGs are decoded at reduced scale via draft(), which skips most of the decode work.
+    Raises OSError for files PIL can't read, including truncated or corrupt ones (which PIL
+    reports as EOFError, SyntaxError or struct.error from its format parsers).
+    """
+    try:
+        with Image.open(file_path) as img:
+            img.draft("L", (DHASH_SIZE * 8, DHASH_SIZE * 8))
+            pixels = list(img.convert("L").resize((DHASH_SIZE + 1, DHASH_SIZE), Image.Resampling.BILINEAR).getdata())
+    except (UnidentifiedImageError, ValueError, Image.DecompressionBombError, EOFError, SyntaxError, struct.error) as exc:
+        raise OSError(exc) from exc
+    value = 0
+    for row in range(DHASH_SIZE):
+        offset = row * (DHASH_SIZE + 1)
+        for col in range(DHASH_SIZE):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return f"{value:016x}"
+
+
+def files_identical(path_a, path_b):
+    """Byte-for-byte comparison of two files."""
+    if os.path.getsize(path_a) != os.path.getsize(path_b):
+        return False
+    with open(path_a, "rb") as fa, open(path_b, "rb") as fb:
+        while True:
+            chunk_a = fa.read(HASH_BUFFER_SIZE)
+            if chunk_a != fb.read(HASH_BUFFER_SIZE):
+                return False
+            if not chunk_a:
+                return True
+
+
+def reflink_file(src, dst):
+    """Creates `dst` as a copy-on-write clone of `src` (Linux FICLONE: Btrfs, XFS, ...).
+
+    Raises OSError where the platform or filesystem can't clone.
+    """
+    if fcntl is None:
+        raise OSError("Reflinks are not supported on this platform")
+    with open(src, "rb") as fsrc, open(dst, "xb") as fdst:
+        fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+
+
+def link_duplicate(keep, duplicate, mode):
+    """Replaces `duplicate` with a hard link ('hardlink') or reflink ('reflink') to `keep`.
+
+    The files are compared byte for byte first. The link is created under a temporary name
+    next to `duplicate` and renamed over it, so `duplicate` is never missing. Returns the
+    bytes reclaimed (0 for reflinks, whose sharing the filesystem doesn't report).
+    """
+    if os.path.samefile(keep, duplicate):
+        return 0
+    if not files_identical(keep, duplicate):
+        raise OSError(f"Content differs from {os.path.basename(keep)}")
+    size = os.path.getsize(duplicate)
+    tmp_path = os.path.join(os.path.dirname(duplicate), f".{os.path.basename(duplicate)}.{os.getpid()}.link")
+    try:
+        if mode == "reflink":
+            reflink_file(keep, tmp_path)
+            shutil.copystat(duplicate, tmp_path)  # The clone keeps the duplicate's own metadata
+        else:
+            os.link(keep, tmp_path)
+        os.replace(tmp_path, duplicate)
+    except OSError:
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return size if mode == "hardlink" else 0
+
+
+def document_shingles(text):
+    """Hashes of the overlapping SHINGLE_WORDS-word sequences of a text (64-bit ints)."""
+    words = re.findall(r"\w+", text.lower())
+    count = max(1, len(words) - SHINGLE_WORDS + 1) if words else 0
+    return {
+        int.from_bytes(hashlib.blake2b(" ".join(words[i : i + SHINGLE_WORDS]).encode(), digest_size=8).digest(), "little")
+        for i in range(count)
+    }
+
+
+def document_minhash(entry, budget):
+    """One-permutation MinHash signature of a document's extracted text, as hex.
+
+    `budget` is {"max_pages", "max_bytes", "max_chars"}: the PDF page and file size limits,
+    and how much text of any document is compared. It's meant to cover whole documents, not
+    the first pages content rules read, so templated files that only share an opening
+    aren't reported as near-duplicates.
+
+    Each shingle hash is hashed once: its low bits pick one of MINHASH_BINS bins and the bin
+    keeps the smallest remaining value. Empty bins are all-ones; two signatures agree on a
+    bin with probability close to the Jaccard similarity of their shingle sets. Returns ""
+    for documents without text. Raises OSError for files whose text can't be extracted.
+    """
+    max_chars = budget["max_chars"]
+    try:
+        is_pdf = entry.name.lower().endswith(".pdf") and PYPDF2_AVAILABLE
+        with PdfAnalysis(entry.path, budget["max_pages"], budget["max_bytes"], entry.size) if is_pdf else nullcontext() as pdf:
+            parts = []
+            length = 0
+            for segment in iter_content_text(entry.path, pdf, text_chars=max_chars, docx_paragraphs=sys.maxsize):
+                parts.append(segment)
+                length += len(segment)
+                if length >= max_chars:
+                    break
+            text = " ".join(parts)[:max_chars]
+    except OSError:
+        raise
+    except Exception as exc:
+        raise OSError(exc) from exc
+    shingles = document_shingles(text)
+    if not shingles:
+        return ""
+    bins = [MINHASH_EMPTY] * MINHASH_BINS
+    for value in shingles:
+        slot, rest = value % MINHASH_BINS, value // MINHASH_BINS
+        if rest < bins[slot]:
+            bins[slot] = rest
+    return "".join(f"{value:015x}" for value in bins)
+
+
+def minhash_similarity(a, b):
+    """Estimated Jaccard similarity of two document_minhash signatures (as int lists)."""
+    shared = agree = 0
+    for x, y in zip(a, b):
+        if x == MINHASH_EMPTY and y == MINHASH_EMPTY:
+            continue
+        shared += 1
+        agree += x == y
+    return agree / shared if shared else 0.0
+
+
+def lsh_band_rows(threshold):
+    """(bands, rows) splitting MINHASH_BINS so pairs near `threshold` likely share a band."""
+    options = [(MINHASH_BINS // rows, rows) for rows in range(1, MINHASH_BINS + 1) if MINHASH_BINS % rows == 0]
+    # The S-curve of b bands of r rows rises at about (1/b)^(1/r); stay a little below the threshold
+    below = [option for option in options if (1 / option[0]) ** (1 / option[1]) <= threshold * 0.9] or options[:1]
+    return max(below, key=lambda option: (1 / option[0]) ** (1 / option[1]))
+
+
+class BKTree:
+    """Burkhard-Keller tree over integer hashes with Hamming distance.
+
+    search() only descends into children whose edge distance is within the radius of the
+    query's distance to the node (triangle inequality), so most of the tree is skipped.
+    """
+
+    def __init__(self):
+        self.root = None  # [value, items, {distance: child}]
+
+    def add(self, value, item):
+        if self.root is None:
+            self.root = [value, [item], {}]
+            return
+        node = self.root
+        while True:
+            d = bin(value ^ node[0]).count("1")
+            if d == 0:
+                node[1].append(item)
+                return
+            child = node[2].get(d)
+            if child is None:
+                node[2][d] = [value, [item], {}]
+                return
+            node = child
+
+    def search(self, value, radius):
+        """Items whose hash is within `radius` bits of `value`."""
+        found = []
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+            d = bin(value ^ node[0]).count("1")
+            if d <= radius:
+                found.extend(node[1])
+            for edge, child in node[2].items():
+                if d - radius <= edge <= d + radius:
+                    stack.append(child)
+        return found
+
+
+class DisjointSet:
+    """Union-find that merges pairwise matches into groups (insertion ordered)."""
+
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, item):
+        self.parent.setdefault(item, item)
+        root = item
+        while self.parent[root] is not root:
+            root = self.parent[root]
+        while self.parent[item] is not root:  # Path compression
+            self.parent[item], item = root, self.parent[item]
+        return root
+
+    def union(self, a, b):
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a is not root_b:
+            self.parent[root_b] = root_a
+
+    def groups(self):
+        """Groups with more than one member, members in insertion order."""
+        return group_by(list(self.parent), self.find)
+
+
+def group_by(items, key):
+    """Groups items by key(item) (insertion ordered), keeping only groups with more than one member."""
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+# --- Log Pipeline ---
+ACTIVITY_LOG_FILE_NAME = ".organizer_activity.jsonl"  # Full log of recent sessions, for export
+LOG_SPILL_MAX_BYTES = 5 * 1024 * 1024  # Rotate the activity log beyond this size...
+LOG_SPILL_BACKUPS = 3  # ...keeping this many older files (.1 is the newest)
+LOG_VIEW_MAX_LINES = 5000  # Lines kept in the on-screen log; older ones stay in the activity log
+LOG_FLUSH_INTERVAL_MS = 100
+
+
+class LogSink:
+    """Thread-safe log buffer shared by the Worker and the window.
+
+    write() only appends to a list under a lock, so the worker thread never waits on the UI.
+    The window drains the buffer on a timer and shows each batch with a single append. With
+    a `spill_path`, every drained line is also written to a rotating JSONL file tagged with
+    the current session (one session per cleared log), which export streams from.
+    """
+
+    def __init__(self, spill_path=None):
+        self._lock = threading.Lock()
+        self._pending = []
+        self.spill_path = spill_path
+        self._spill = None
+        self._session_count = 0
+        self.session = None
+        self.session_lines = 0
+        self.new_session()
+
+    def write(self, message):
+        with self._lock:
+            self._pending.append(message)
+
+    def drain(self):
+        """Returns the queued lines (oldest first) and spills them to the activity log."""
+        with self._lock:
+            batch, self._pending = self._pending, []
+        if batch:
+            self.session_lines += len(batch)
+            self._spill_lines(batch)
+        return batch
+
+    def new_session(self):
+        """Starts a new session; lines queued before this belong to the previous one."""
+        self.drain()
+        self._session_count += 1
+        self.session = f"{os.getpid()}-{int(time.time())}-{self._session_count}"
+        self.session_lines = 0
+
+    def _spill_lines(self, lines):
+        if not self.spill_path:
+            return
+        try:
+            if self._spill is None:
+                self._spill = open(self.spill_path, "a", encoding="utf-8")
+            stamp = datetime.now().isoformat(timespec="seconds")
+            self._spill.write(
+                "".join(json.dumps({"session": self.session, "time": stamp, "message": line}) + "\n" for line in lines)
+            )
+            self._spill.flush()
+            if self._spill.tell() > LOG_SPILL_MAX_BYTES:
+                self._rotate()
+        except OSError:
+            self.spill_path = None  # The on-screen log keeps working without the activity log
+
+    def _rotate(self):
+        self._spill.close()
+        self._spill = None
+        for i in range(LOG_SPILL_BACKUPS, 0, -1):
+            source = self.spill_path if i == 1 else f"{self.spill_path}.{i - 1}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.spill_path}.{i}")
+
+    def iter_session(self, session=None):
+        """Yields the spilled lines of a session (the current one by default), oldest first."""
+        session = session or self.session
+        paths = [f"{self.spill_path}.{i}" for i in range(LOG_SPILL_BACKUPS, 0, -1)] + [self.spill_path]
+        for path in paths:
+            try:
+                f = open(path, "r", encoding="utf-8")
+            except OSError:
+                continue
+            with f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get("session") == session:
+                        yield record.get("message", "")
+
+    def close(self):
+        self.drain()
+        if self._spill is not None:
+            self._spill.close()
+            self._spill = None
+
+
+# --- Progress Reporting ---
+class ProgressReporter:
+    """Throttled progress for one phase of a task: at most one update per PROGRESS_INTERVAL.
+
+    Each update emits the Worker's progress_updated (for the bar) and progress_stats with the
+    phase name, items/s, bytes/s and an ETA in seconds (-1 while unknown). The ETA follows the
+    byte rate when the phase's total bytes are known, otherwise the item rate.
+    """
+
+    def __init__(self, worker, phase, total, total_bytes=0):
+        self.worker = worker
+        self.phase = phase
+        self.total = total
+        self.total_bytes = total_bytes
+        self.done = 0
+        self.bytes_done = 0
+        self.started = time.monotonic()
+        self._last_emit = 0.0
+
+    def advance(self, items=1, nbytes=0):
+        self.done += items
+        self.bytes_done += nbytes
+        now = time.monotonic()
+        if now - self._last_emit >= PROGRESS_INTERVAL or self.done >= self.total:
+            self._emit(now)
+
+    def finish(self):
+        """Emits the final state (e.g. after a loop that ended early)."""
+        self._emit(time.monotonic())
+
+    def _emit(self, now):
+        self._last_emit = now
+        elapsed = max(now - self.started, 1e-6)
+        items_per_sec = self.done / elapsed
+        bytes_per_sec = self.bytes_done / elapsed
+        if self.total_bytes and bytes_per_sec > 0:
+            eta = max(0.0, (self.total_bytes - self.bytes_done) / bytes_per_sec)
+        elif items_per_sec > 0:
+            eta = (self.total - self.done) / items_per_sec
+        else:
+            eta = -1.0
+        # Counts go out as int (bar), byte figures as float: Qt's int is 32-bit
+        self.worker.progress_updated.emit(min(self.done, self.total), self.total)
+        self.worker.progress_stats.emit(self.phase, items_per_sec, bytes_per_sec, eta)
+
+
+# --- Preview Rows ---
+class PreviewRows:
+    """Columnar rows of an organization preview: one list per column instead of a tuple per row.
+
+    Action names and statuses are shared constant strings and the original paths are the ones
+    the plan holds anyway, so a row costs a few list slots plus its destination text. The
+    "details" text shown in the preview is formatted on demand from destination and status.
+    """
+
+    def __init__(self):
+        self.actions = []
+        self.originals = []
+        self.destinations = []  # As displayed: relative to the organized folder, or "**DELETE**"
+        self.statuses = []
+
+    def append(self, action_type, original, destination, status):
+        self.actions.append(action_type)
+        self.originals.append(original)
+        self.destinations.append(destination)
+        self.statuses.append(status)
+
+    def details(self, i):
+        return f"{self.destinations[i]} {self.statuses[i]}"
+
+    def row(self, i):
+        """(action, original path, details) of row i."""
+        return self.actions[i], self.originals[i], self.details(i)
+
+    def __len__(self):
+        return len(self.actions)
+
+
 class Worker(QObject):
-    log_message = Signal(str)
     progress_updated = Signal(int, int)
+    progress_stats = Signal(str, float, float, float)  # Phase, items/s, bytes/s, ETA seconds (-1 = unknown)
     finished = Signal()
     single_file_organized = Signal(str)
-    duplicate_scan_finished = Signal(dict)
-    organization_preview_ready = Signal(list, dict, bool)
+    duplicate_scan_finished = Signal(object, list)  # {set key: [FileEntry]}, [[paths] already hard-linked]
+    duplicates_processed = Signal(str)  # Summary of a delete/link run over selected duplicates
+    organization_preview_ready = Signal(object, dict, bool)  # PreviewRows, plan, backup flag
     folder_stats_ready = Signal(int, str, dict)  # MODIFIED: int, str, dict
 
     def __init__(self):
@@ -247,30 +2103,203 @@ class Worker(QObject):
         self.conflict_strategy = "rename"  # Default strategy
         self.file_metadata_cache = {}  # Cache for EXIF/Doc metadata
         self.has_content_rules = False  # ADDED: Flag for content scan optimization
+        self.rule_plan = []  # CompiledRule objects built from self.rules
+        self.rule_plan_warnings = []
+        self.content_scanner = KeywordScanner(())  # Matches all content-rule keywords in one pass
+        self.category_index = {}  # Lower-cased extension -> category, see _build_category_index
+        self.category_overlaps = {}
+        self.image_extensions = frozenset()
+        self.planner_stats = {"content": 0, "metadata": 0}  # Costly evaluations avoided by condition ordering
+        self.performance = dict(PERFORMANCE_DEFAULTS)
+        self.log_sink = LogSink()  # Replaced by the window's sink, which also spills to disk
+        self._cancel_requested = threading.Event()
+        self._unpaused = threading.Event()
+        self._unpaused.set()
         self.load_settings()  # Load initial settings
 
+    def log(self, message):
+        """Queues a log line; the window shows queued lines in periodic batches."""
+        self.log_sink.write(message)
+
+    # Job control. A running slot keeps this thread busy, so the window calls these directly
+    # (they only set events) instead of going through queued signals.
+    def pause(self):
+        self._unpaused.clear()
+
+    def resume(self):
+        self._unpaused.set()
+
+    def cancel(self):
+        self._cancel_requested.set()
+        self._unpaused.set()  # A paused job has to run on to its next checkpoint to stop
+
+    def cancelled(self):
+        """Checkpoint for job loops: waits while the job is paused, then True if it should stop."""
+        self._unpaused.wait()
+        return self._cancel_requested.is_set()
+
+    def _start_job(self):
+        self._cancel_requested.clear()
+        self._unpaused.set()
+
     def load_settings(self):
         """Loads settings from the default JSON file."""
         try:
             with open(SETTINGS_FILE_NAME, "r") as f:
                 settings = json.load(f)
-                self.categories = settings.get("categories", self._get_defaults("categories"))
-                self.rules = settings.get("rules", self._get_defaults("rules"))
-                # ADDED: Check for content rules
-                self.has_content_rules = any(
-                    cond.get("type") == "content" for rule in self.rules for cond in rule.get("conditions", [])
+                self.apply_settings(
+                    settings.get("categories", self._get_defaults("categories")),
+                    settings.get("rules", self._get_defaults("rules")),
                 )
+                self.apply_performance_settings(settings.get("performance"))
                 loaded_conflict = settings.get("conflict_strategy", "rename")
                 self.conflict_strategy = "rename" if loaded_conflict == "overwrite" else loaded_conflict  # Migrate away from overwrite
         except (FileNotFoundError, json.JSONDecodeError):
-            self.categories = self._get_defaults("categories")
-            self.rules = self._get_defaults("rules")
-            # ADDED: Check for content rules
-            self.has_content_rules = any(
-                cond.get("type") == "content" for rule in self.rules for cond in rule.get("conditions", [])
-            )
+            self.apply_settings(self._get_defaults("categories"), self._get_defaults("rules"))
+            self.apply_performance_settings(None)
             self.conflict_strategy = "rename"  # Ensure default on error
 
+    def apply_settings(self, categories, rules):
+        """Sets categories/rules and compiles the rules once into matcher objects."""
+        self.categories = categories
+        self.rules = rules
+        self.rule_plan = [CompiledRule(rule) for rule in rules]
+        self.rule_plan_warnings = [warning for rule in self.rule_plan for warning in rule.warnings()]
+        self.has_content_rules = any(rule.has_content for rule in self.rule_plan)
+        self.content_scanner = KeywordScanner(
+            cond.needle for rule in self.rule_plan for cond in rule.conditions if cond.cond_type == "content"
+        )
+        self._build_category_index()
+
+    def _build_category_index(self):
+        """Precomputes extension -> category for O(1) classification.
+
+        Precedence for extensions listed in several categories: 'Images' first (it drives EXIF-based
+        sorting), then categories in settings order, i.e. the row order of the Category Editor.
+        """
+        ordered = sorted(self.categories.items(), key=lambda item: item[0] != "Images")  # Stable sort
+        self.category_index = {}
+        self.category_overlaps = {}  # ext -> all categories listing it, winner first
+        for category, exts in ordered:
+            for ext in exts:
+                ext = ext.lower()
+                if ext in self.category_index:
+                    overlap = self.category_overlaps.setdefault(ext, [self.category_index[ext]])
+                    if category not in overlap:
+                        overlap.append(category)
+                else:
+                    self.category_index[ext] = category
+        self.image_extensions = frozenset(ext.lower() for ext in self.categories.get("Images", []))
+
+    def describe_category_overlaps(self):
+        """Human-readable list of overlapping extensions and which category wins."""
+        return [f"{ext} in {', '.join(cats)} -> {cats[0]}" for ext, cats in sorted(self.category_overlaps.items())]
+
+    def _iter_prepared_files(self, entries, index):
+        """Yields (entry, file_cache) for each file, with index results loaded.
+
+        For large runs, metadata the rules will need is extracted by a process pool a bounded
+        number of files ahead of rule evaluation, then merged into the file's cache.
+        """
+
+        def jobs():
+            for entry in entries:
+                try:
+                    cache = self._index_lookup(index, entry) if index else {}
+                except sqlite3.Error as exc:
+                    self.log(f"  - WARN: File index disabled for this run: {exc}")
+                    index.disable()
+                    cache = {}
+                yield (entry, cache), self._metadata_job(entry, cache)
+
+        workers = self._metadata_worker_count()
+        if workers <= 1 or len(entries) < PREFETCH_MIN_FILES:
+            for item, _job in jobs():
+                yield item
+            return
+
+        self.log(f"Extracting metadata with {workers} worker processes...")
+        with MetadataPrefetcher(workers, self.content_scanner.keywords, self._pdf_budget()) as prefetcher:
+            for (entry, cache), result in prefetcher.run(jobs()):
+                if result:
+                    warning = result.pop("warning", None)
+                    if warning:
+                        self.log(f"  - WARN: {warning}")
+                    cache.setdefault("content", {}).update(result.pop("content", {}))
+                    cache.update(result)
+                yield entry, cache
+
+    def _metadata_job(self, entry, cache):
+        """Decides which extractions rule evaluation will need for a file; None if there are none."""
+        ext = os.path.splitext(entry.name)[1].lower()
+        want_exif = ext in self.image_extensions and "exif" not in cache
+        want_doc_meta = want_content = False
+        if ext in CONTENT_EXTENSIONS or ext in DOC_META_EXTENSIONS:
+            slots = self._reachable_slots(FileContext(entry.path, entry, cache))
+            want_doc_meta = ext in DOC_META_EXTENSIONS and ("doc_meta",) in slots and "doc_meta" not in cache
+            known_content = cache.get("content", {})
+            want_content = ext in CONTENT_EXTENSIONS and any(
+                slot[0] == "content" and slot[1] not in known_content for slot in slots
+            )
+        if not (want_exif or want_doc_meta or want_content):
+            return None
+        return entry.path, want_exif, want_doc_meta, want_content
+
+    def _reachable_slots(self, ctx):
+        """Cache slots of costly conditions in rules whose cheap conditions all pass for this file."""
+        slots = set()
+        rule_results = ctx.cache.get("rules", {})
+        for rule in self.rule_plan:
+            costly = [cond for cond in rule.conditions if cond.cost > COST_CHEAP]
+            if not costly or (rule.cache_key and rule.cache_key in rule_results):
+                continue
+            try:
+                reachable = all(cond.test(self, ctx) for cond in rule.conditions if cond.cost == COST_CHEAP)
+            except Exception:
+                reachable = True  # Failing conditions are skipped during evaluation
+            if reachable:
+                slots.update(cond.cache_slot() for cond in costly)
+        return slots
+
+    def _metadata_worker_count(self):
+        """Configured 'metadata_workers'; 0 means one per CPU core minus one, 1 disables the pool."""
+        try:
+            configured = int(self.performance.get("metadata_workers", 0))
+        except (TypeError, ValueError):
+            configured = 0
+        return configured if configured > 0 else max(1, (os.cpu_count() or 2) - 1)
+
+    def _hash_worker_count(self):
+        """Configured 'hash_workers'; 0 means one per CPU core, up to 8."""
+        try:
+            configured = int(self.performance.get("hash_workers", 0))
+        except (TypeError, ValueError):
+            configured = 0
+        return configured if configured > 0 else min(8, os.cpu_count() or 1)
+
+    def _hash_algorithm(self):
+        algorithm = str(self.performance.get("duplicate_hash_algorithm", "md5")).lower()
+        if algorithm not in HASH_ALGORITHMS:
+            self.log(f"  - WARN: Unknown hash algorithm '{algorithm}', using md5.")
+            algorithm = "md5"
+        return algorithm
+
+    def apply_performance_settings(self, performance):
+        """Merges the 'performance' settings section over PERFORMANCE_DEFAULTS."""
+        self.performance = dict(PERFORMANCE_DEFAULTS)
+        if isinstance(performance, dict):
+            self.performance.update(performance)
+
+    def _open_file_index(self, folder):
+        """Opens the folder's persistent index, or returns None (the run then works without it)."""
+        try:
+            # Categories decide which files get EXIF read, so cached outcomes are only valid for the same ones
+            settings_key = hashlib.sha1(json.dumps(self.categories, sort_keys=True).encode()).hexdigest()[:16]
+            return FileIndex(folder, settings_key)
+        except sqlite3.Error as exc:
+            self.log(f"  - WARN: File index unavailable, evaluating all files: {exc}")
+            return None
+
     def _get_defaults(self, key):
         if key == "categories":
             # ... (Default categories remain the same)
@@ -355,253 +2384,177 @@ class Worker(QObject):
         return {}
 
     # --- Metadata Helper Functions ---
-    # ... (_get_exif_data, _get_pdf_metadata, _get_docx_metadata remain the same) ...
+    # The extraction itself lives in module-level functions so it can also run in worker processes
     def _get_exif_data(self, file_path):
         """Extracts and decodes EXIF data from an image file."""
-        if not file_path.lower().endswith(tuple(self.categories.get("Images", []))):
-            return {}
-        try:
-            with Image.open(file_path) as img:
-                exif_data = img._getexif()
-                if not exif_data:
-                    return {}
-
-                exif = {}
-                for key, val in exif_data.items():
-                    tag = TAGS.get(key, key)
-                    if isinstance(val, bytes):
-                        try:
-                            val = val.decode("utf-8", errors="ignore").strip()
-                        except Exception:
-                            val = str(val)
-                    if isinstance(val, str):
-                        val = val.strip()
-                    exif[tag] = val
-
-                # Special handling for FNumber
-                if "FNumber" in exif:
-                    f_num = exif["FNumber"]
-                    if isinstance(f_num, tuple) and len(f_num) == 2 and f_num[1] != 0:
-                        exif["FNumber"] = float(f_num[0] / f_num[1])
-                    elif isinstance(f_num, (int, float)):
-                        exif["FNumber"] = float(f_num)
-
-                return exif
-        except (UnidentifiedImageError, IOError, AttributeError, OSError, TypeError):
-            # Catch more errors as EXIF data can be corrupt
+        if os.path.splitext(file_path)[1].lower() not in self.image_extensions:
             return {}
+        return read_exif_data(file_path)
 
-    def _get_pdf_metadata(self, file_path):
+    def _get_pdf_metadata(self, file_path, pdf=None):
         """Extracts metadata from a PDF file."""
-        if not PYPDF2_AVAILABLE or not file_path.lower().endswith(".pdf"):
-            return {}
+        return read_pdf_metadata(file_path, pdf)
+
+    def _pdf_budget(self):
+        """Page/byte budget for PDF text extraction, from the performance settings."""
         try:
-            with open(file_path, "rb") as f:
-                reader = PyPDF2.PdfReader(f, strict=False)
-                if reader.is_encrypted:
-                    return {}
-                info = reader.metadata
-                return {"author": getattr(info, "author", "") or "", "title": getattr(info, "title", "") or ""}
-        except Exception:
-            return {}
+            max_pages = int(self.performance.get("pdf_scan_pages", PERFORMANCE_DEFAULTS["pdf_scan_pages"]))
+            max_mb = float(self.performance.get("pdf_scan_max_mb", PERFORMANCE_DEFAULTS["pdf_scan_max_mb"]))
+        except (TypeError, ValueError):
+            max_pages, max_mb = PERFORMANCE_DEFAULTS["pdf_scan_pages"], PERFORMANCE_DEFAULTS["pdf_scan_max_mb"]
+        return {"max_pages": max_pages, "max_bytes": int(max_mb * 1024 * 1024)}
+
+    def _similarity_budget(self):
+        """Text budget for "Similar Documents": its own page and text limits, the PDF size limit of content rules."""
+        try:
+            max_pages = int(self.performance.get("document_similarity_pages", PERFORMANCE_DEFAULTS["document_similarity_pages"]))
+            text_mb = float(self.performance.get("document_similarity_text_mb", PERFORMANCE_DEFAULTS["document_similarity_text_mb"]))
+        except (TypeError, ValueError):
+            max_pages = PERFORMANCE_DEFAULTS["document_similarity_pages"]
+            text_mb = PERFORMANCE_DEFAULTS["document_similarity_text_mb"]
+        return {
+            "max_pages": max(1, max_pages),
+            "max_bytes": self._pdf_budget()["max_bytes"],
+            "max_chars": max(1, int(text_mb * 1024 * 1024)),
+        }
+
+    def _index_lookup(self, index, entry):
+        """Index results for a file; PDF content outcomes are dropped if the scan budget changed."""
+        cache = index.lookup(entry)
+        if entry.name.lower().endswith(".pdf"):
+            budget = self._pdf_budget()
+            budget_key = [budget["max_pages"], budget["max_bytes"]]
+            if cache.get("pdf_scan") != budget_key:
+                cache.pop("content", None)
+                cache.pop("rules", None)
+                cache["pdf_scan"] = budget_key
+        return cache
+
+    def _pdf_analysis(self, ctx):
+        """The file's PdfAnalysis, memoized in the metadata cache until _release_file_cache."""
+        if not PYPDF2_AVAILABLE or not ctx.name_lower.endswith(".pdf"):
+            return None
+        pdf = ctx.cache.get("pdf")
+        if pdf is None:
+            pdf = ctx.cache["pdf"] = PdfAnalysis(ctx.path, size=ctx.entry.size if ctx.entry else None, **self._pdf_budget())
+        return pdf
+
+    @staticmethod
+    def _release_file_cache(file_cache):
+        """Closes per-file resources (an open PdfAnalysis) once a file has been classified."""
+        pdf = file_cache.pop("pdf", None)
+        if pdf is not None:
+            pdf.close()
 
     def _get_docx_metadata(self, file_path):
         """Extracts metadata from a DOCX file."""
-        if not DOCX_AVAILABLE or not file_path.lower().endswith(".docx"):
-            return {}
-        try:
-            doc = docx.Document(file_path)
-            props = doc.core_properties
-            return {"author": props.author or "", "title": props.title or ""}
-        except Exception:
-            return {}
+        return read_docx_metadata(file_path)
 
     # --- Core Logic ---
-    # ... (check_file_content, check_rule_conditions, determine_destination_and_action remain the same) ...
-    def check_file_content(self, file_path, keyword):
-        keyword = keyword.lower()
-        ext = os.path.splitext(file_path)[1].lower()
-        try:
-            if ext == ".txt":
-                with open(file_path, "r", encoding="utf-8", errors="ignore") as f:
-                    content = f.read(1024 * 1024)
-                if keyword in content.lower():
-                    return True
-            elif PYPDF2_AVAILABLE and ext == ".pdf":
-                if os.path.getsize(file_path) > 5 * 1024 * 1024:
-                    return False
-                with open(file_path, "rb") as f:
-                    reader = PyPDF2.PdfReader(f, strict=False)
-                if reader.is_encrypted:
-                    return False
-                for i in range(min(len(reader.pages), 2)):
-                    page = reader.pages[i]
-                    page_text = page.extract_text()
-                    if page_text and keyword in page_text.lower():
-                        return True
-            elif DOCX_AVAILABLE and ext == ".docx":
-                doc = docx.Document(file_path)
-                for i in range(min(len(doc.paragraphs), 10)):
-                    para = doc.paragraphs[i]
-                    if keyword in para.text.lower():
-                        return True
-        except Exception as exc:
-            self.log_message.emit(f"  - WARN: Scan content error {os.path.basename(file_path)}: {exc}")
-            return False
-        return False
+    def check_file_content(self, file_path, scanner, pdf=None):
+        """Extracts the file's text once and returns the set of scanner keywords found in it."""
+        found, error = scan_file_content(file_path, scanner, pdf)
+        if error:
+            self.log(f"  - WARN: Scan content error {os.path.basename(file_path)}: {error}")
+        return found
+
+    def cached_exif(self, ctx):
+        """EXIF data for the file, read at most once per file."""
+        if "exif" not in ctx.cache:
+            ctx.cache["exif"] = self._get_exif_data(ctx.path)
+        return ctx.cache["exif"]
+
+    def cached_doc_meta(self, ctx):
+        """PDF/DOCX metadata for the file, read at most once per file."""
+        if "doc_meta" not in ctx.cache:
+            lower_name = ctx.name_lower
+            if lower_name.endswith(".pdf"):
+                ctx.cache["doc_meta"] = self._get_pdf_metadata(ctx.path, self._pdf_analysis(ctx))
+            elif lower_name.endswith(".docx"):
+                ctx.cache["doc_meta"] = self._get_docx_metadata(ctx.path)
+            else:
+                ctx.cache["doc_meta"] = {}
+        return ctx.cache["doc_meta"]
 
-    def check_rule_conditions(self, file_path, conditions):
-        """Checks if a file meets all conditions of a rule."""
-        if not conditions:
-            return False
+    def content_matches(self, ctx, keyword):
+        """Content check for a lower-cased keyword.
 
-        try:
-            file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
-            file_mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-            now = datetime.now()
-        except OSError as exc:
-            self.log_message.emit(f"  - WARN: Could not get stats for {os.path.basename(file_path)}: {exc}")
+        The first lookup scans the file once for every content keyword of every rule; the
+        per-keyword outcomes are cached (and persisted in the file index) for all later rules.
+        """
+        content_cache = ctx.cache.setdefault("content", {})
+        if keyword not in content_cache:
+            hits = self.check_file_content(ctx.path, self.content_scanner, self._pdf_analysis(ctx))
+            for needle in self.content_scanner.keywords:
+                content_cache[needle] = needle in hits
+        return content_cache.get(keyword, False)
+
+    def check_rule_conditions(self, ctx, rule):
+        """Checks if a file meets all conditions of a compiled rule."""
+        if not rule.has_conditions or ctx.entry is None:
             return False
 
-        # Ensure file cache exists for this path
-        if file_path not in self.file_metadata_cache:
-            self.file_metadata_cache[file_path] = {}
-
-        for cond in conditions:
-            cond_type = cond.get("type", "").lower()
-            cond_value = cond.get("value", "")
-            cond_matcher = cond.get("matcher", "contains").lower()
-            if not cond_type or not cond_value:
-                continue
-
-            match = False
-
+        for i, cond in enumerate(rule.conditions):
             try:
-                if cond_type == "filename":
-                    filename = os.path.basename(file_path)
-                    if cond_matcher == "contains" and cond_value.lower() in filename.lower():
-                        match = True
-                    elif cond_matcher == "startswith" and filename.lower().startswith(cond_value.lower()):
-                        match = True
-                    elif cond_matcher == "endswith" and filename.lower().endswith(cond_value.lower()):
-                        match = True
-                    elif cond_matcher == "equals" and filename.lower() == cond_value.lower():
-                        match = True
-                    elif cond_matcher == "regex" and re.search(cond_value, filename, re.IGNORECASE):
-                        match = True
-
-                elif cond_type == "content":
-                    # --- OPTIMIZATION ---
-                    if not self.has_content_rules:
-                        match = False  # Skip if no content rules exist globally
-                    elif self.check_file_content(file_path, cond_value):
-                        match = True
-                    # --- END OPTIMIZATION ---
-
-                elif cond_type == "filesize_mb":
-                    size_val = float(cond_value)
-                    if cond_matcher == "greater_than" and file_size_mb > size_val:
-                        match = True
-                    elif cond_matcher == "less_than" and file_size_mb < size_val:
-                        match = True
-
-                elif cond_type == "date_modified_days":
-                    days_val = int(cond_value)
-                    delta = now - file_mtime
-                    if cond_matcher == "older_than" and delta.days > days_val:
-                        match = True
-                    elif cond_matcher == "newer_than" and delta.days < days_val:
-                        match = True
-
-                elif cond_type == "original folder name":
-                    folder_name = os.path.basename(os.path.dirname(file_path))
-                    if cond_matcher == "contains" and cond_value.lower() in folder_name.lower():
-                        match = True
-                    elif cond_matcher == "startswith" and folder_name.lower().startswith(cond_value.lower()):
-                        match = True
-                    elif cond_matcher == "endswith" and folder_name.lower().endswith(cond_value.lower()):
-                        match = True
-                    elif cond_matcher == "equals" and folder_name.lower() == cond_value.lower():
-                        match = True
-                    elif cond_matcher == "regex" and re.search(cond_value, folder_name, re.IGNORECASE):
-                        match = True
-
-                elif cond_type in ["camera model", "lens model", "artist"]:
-                    if "exif" not in self.file_metadata_cache[file_path]:
-                        self.file_metadata_cache[file_path]["exif"] = self._get_exif_data(file_path)
-                    exif = self.file_metadata_cache[file_path]["exif"]
-                    if not exif:
-                        continue
-
-                    key = {"camera model": "Model", "lens model": "LensModel", "artist": "Artist"}.get(cond_type)
-                    value = str(exif.get(key, ""))
-
-                    if cond_matcher == "contains" and cond_value.lower() in value.lower():
-                        match = True
-                    elif cond_matcher == "equals" and cond_value.lower() == value.lower():
-                        match = True
-
-                elif cond_type == "f-stop":
-                    if "exif" not in self.file_metadata_cache[file_path]:
-                        self.file_metadata_cache[file_path]["exif"] = self._get_exif_data(file_path)
-                    exif = self.file_metadata_cache[file_path]["exif"]
-                    if not exif or "FNumber" not in exif:
-                        continue
-
-                    value = exif.get("FNumber")
-                    cond_num = float(cond_value)
-
-                    if cond_matcher == "equals" and value == cond_num:
-                        match = True
-                    elif cond_matcher == "greater_than" and value > cond_num:
-                        match = True
-                    elif cond_matcher == "less_than" and value < cond_num:
-                        match = True
-
-                elif cond_type in ["pdf author", "pdf title", "docx author", "docx title"]:
-                    if "doc_meta" not in self.file_metadata_cache[file_path]:
-                        if file_path.lower().endswith(".pdf"):
-                            self.file_metadata_cache[file_path]["doc_meta"] = self._get_pdf_metadata(file_path)
-                        elif file_path.lower().endswith(".docx"):
-                            self.file_metadata_cache[file_path]["doc_meta"] = self._get_docx_metadata(file_path)
-                        else:
-                            self.file_metadata_cache[file_path]["doc_meta"] = {}
-
-                    meta = self.file_metadata_cache[file_path].get("doc_meta", {})
-                    if not meta:
-                        continue
-
-                    key = "author" if "author" in cond_type else "title"
-                    value = str(meta.get(key, ""))
-
-                    if cond_matcher == "contains" and cond_value.lower() in value.lower():
-                        match = True
-                    elif cond_matcher == "equals" and cond_value.lower() == value.lower():
-                        match = True
-
+                match = cond.test(self, ctx)
             except Exception as exc:
-                # Catch errors from regex, float conversion, etc.
-                self.log_message.emit(
-                    f"  - WARN: Rule check error for {os.path.basename(file_path)} (Type: {cond_type}, Value: {cond_value}): {exc}"
+                # Catch errors from comparisons on odd metadata values, etc.
+                self.log(
+                    f"  - WARN: Rule check error for {ctx.name} (Type: {cond.cond_type}, Value: {cond.value}): {exc}"
                 )
                 continue  # Skip this condition if it fails
 
             if not match:
+                # Record costly conditions the user wrote before this one: in written order they would have run
+                for later in rule.conditions[i + 1 :]:
+                    if later.cost > cond.cost and later.position < cond.position:
+                        ctx.skipped.add(later.cache_slot())
                 return False  # If any condition fails, exit
 
         return True  # All conditions passed
 
-    def determine_destination_and_action(self, file_path):
+    def _record_planner_savings(self, ctx):
+        """Counts skipped costly evaluations that no other rule ended up needing for this file."""
+        for slot in ctx.skipped:
+            if slot[0] == "content":
+                if slot[1] not in ctx.cache.get("content", {}):
+                    self.planner_stats["content"] += 1
+            elif slot[0] not in ctx.cache:
+                self.planner_stats["metadata"] += 1
+
+    def determine_destination_and_action(self, file_path, entry=None):
         """Determines destination folder OR new name based on rules/categories."""
         # Ensure cache exists for this file
         if file_path not in self.file_metadata_cache:
             self.file_metadata_cache[file_path] = {}
 
-        # 1. Check Rules first
-        for rule in self.rules:
-            if self.check_rule_conditions(file_path, rule.get("conditions")):
-                action_type = rule.get("action_type", "move").lower()
-                action_value = rule.get("action_value", "")
+        if entry is None and self.rules:
+            try:
+                entry = FileEntry.from_path(file_path)
+            except OSError as exc:
+                self.log(f"  - WARN: Could not get stats for {os.path.basename(file_path)}: {exc}")
+
+        ctx = FileContext(file_path, entry, self.file_metadata_cache[file_path])
+        result = self._classify(ctx)
+        self._record_planner_savings(ctx)
+        return result
+
+    def _classify(self, ctx):
+        """Runs the compiled rules, then the category mapping, for one file."""
+        file_path = ctx.path
+        entry = ctx.entry
+
+        # 1. Check Rules first (outcomes of date-independent rules are reused from the file index)
+        rule_results = ctx.cache.setdefault("rules", {})
+        for rule in self.rule_plan:
+            matched = rule_results.get(rule.cache_key) if rule.cache_key else None
+            if matched is None:
+                matched = self.check_rule_conditions(ctx, rule)
+                if rule.cache_key and entry is not None:
+                    rule_results[rule.cache_key] = matched
+            if matched:
+                action_type = rule.action_type
+                action_value = rule.action_value
 
                 # 'delete' action doesn't require a value
                 if action_type == "delete":
@@ -628,12 +2581,11 @@ class Worker(QObject):
         # 2. Check Categories (default sorting, always 'move')
         dest_folder = "Other"
         ext = os.path.splitext(file_path)[1].lower()
-        if ext in self.categories.get("Images", []):
+        category = self.category_index.get(ext)
+        if category == "Images":
             try:
                 # Use cached EXIF data if available
-                if "exif" not in self.file_metadata_cache[file_path]:
-                    self.file_metadata_cache[file_path]["exif"] = self._get_exif_data(file_path)
-                exif = self.file_metadata_cache[file_path].get("exif", {})
+                exif = self.cached_exif(ctx)
 
                 if exif:
                     dt_str = exif.get("DateTimeOriginal") or exif.get("DateTime")
@@ -658,11 +2610,8 @@ class Worker(QObject):
                     dest_folder = "Images"
             except Exception:
                 dest_folder = "Images"
-        else:
-            for cat, exts in self.categories.items():
-                if ext in exts:
-                    dest_folder = cat
-                    break
+        elif category:
+            dest_folder = category
         return "move", dest_folder, os.path.basename(file_path)
 
     @Slot(str)
@@ -673,14 +2622,28 @@ class Worker(QObject):
         if not os.path.exists(path) or os.path.basename(path).startswith("."):
             return
 
-        self.log_message.emit(f"Watcher: New file - {os.path.basename(path)}")
-        action_type, dest_rel_path, new_name = self.determine_destination_and_action(path)
+        self.log(f"Watcher: New file - {os.path.basename(path)}")
         base_path = os.path.dirname(path)
+        try:
+            entry = FileEntry.from_path(path)
+        except OSError:
+            entry = None
+        index = self._open_file_index(base_path) if entry else None
+        if index:
+            self.file_metadata_cache[path] = self._index_lookup(index, entry)
+        action_type, dest_rel_path, new_name = self.determine_destination_and_action(path, entry)
+        self._release_file_cache(self.file_metadata_cache.get(path, {}))
+        if index:
+            try:
+                index.store(entry, self.file_metadata_cache.get(path, {}))
+                index.close()
+            except sqlite3.Error as exc:
+                self.log(f"  - WARN: Could not update file index: {exc}")
 
         try:
             if action_type == "delete":
                 os.remove(path)
-                self.log_message.emit(f"  - DELETED '{os.path.basename(path)}' by rule.")
+                self.log(f"  - DELETED '{os.path.basename(path)}' by rule.")
                 self.single_file_organized.emit(f"Deleted: {os.path.basename(path)}")
                 return  # Stop processing after delete
 
@@ -698,106 +2661,106 @@ class Worker(QObject):
                 final_dest = os.path.join(dest_path_dir, new_name)
                 log_dest_folder = "(Renamed)"
             else:
-                self.log_message.emit(f"  - SKIPPED: Unknown action type '{action_type}'")
+                self.log(f"  - SKIPPED: Unknown action type '{action_type}'")
                 return
 
             if not os.path.exists(dest_path_dir):
                 os.makedirs(dest_path_dir)
 
-            target_exists = os.path.exists(final_dest)
+            namespace = DestinationNamespace()  # One listing of the folder instead of a stat per candidate name
+            target_exists = namespace.exists(final_dest)
             is_same_file = os.path.normpath(path) == os.path.normpath(final_dest)
 
             if target_exists and not is_same_file:
                 strategy = self.conflict_strategy
                 if strategy == "skip":
-                    self.log_message.emit(f"  - SKIPPED (Conflict)")
+                    self.log(f"  - SKIPPED (Conflict)")
                     return
                 elif strategy == "rename":
-                    base, ext = os.path.splitext(new_name)
-                    count = 1
-                    while os.path.exists(final_dest):
-                        final_dest = os.path.join(dest_path_dir, f"{base} ({count}){ext}")
-                        count += 1
-                    self.log_message.emit(f"  - RENAMED (Conflict) to '{os.path.basename(final_dest)}'")
+                    final_dest = namespace.reserve_unique(final_dest)
+                    self.log(f"  - RENAMED (Conflict) to '{os.path.basename(final_dest)}'")
                 # REMOVED: Overwrite logic
 
             # Execute the action
             if action_type == "move":
                 shutil.move(path, final_dest)
-                self.log_message.emit(f"  - Moved to '{log_dest_folder}'")
+                self.log(f"  - Moved to '{log_dest_folder}'")
                 self.single_file_organized.emit(f"Organized: {os.path.basename(final_dest)}")
             elif action_type == "copy":
                 shutil.copy2(path, final_dest)
-                self.log_message.emit(f"  - Copied to '{log_dest_folder}'")
+                self.log(f"  - Copied to '{log_dest_folder}'")
                 self.single_file_organized.emit(f"Copied: {os.path.basename(final_dest)}")  # copy2 preserves metadata
             elif action_type == "rename":
                 if not is_same_file:
                     shutil.move(path, final_dest)
-                    self.log_message.emit(f"  - Renamed to '{os.path.basename(final_dest)}'")
+                    self.log(f"  - Renamed to '{os.path.basename(final_dest)}'")
                     self.single_file_organized.emit(f"Renamed: {os.path.basename(final_dest)}")
                 else:
-                    self.log_message.emit(f"  - INFO: Rename rule resulted in same filename, skipped.")
+                    self.log(f"  - INFO: Rename rule resulted in same filename, skipped.")
 
         except Exception as exc:
-            self.log_message.emit(f"  - ERROR organizing {os.path.basename(path)}: {exc}")
+            self.log(f"  - ERROR organizing {os.path.basename(path)}: {exc}")
 
     @Slot(str, bool, bool)  # Added is_recursive flag
     def run_organization_preview(self, path, backup_first, is_recursive):
         """Generates the preview of organization actions, including copy/delete."""
+        self._start_job()
         self.file_metadata_cache = {}  # Clear cache for new preview
-        self.log_message.emit("--- Generating Organization Preview ---")
+        self.planner_stats = {"content": 0, "metadata": 0}
+        self.log("--- Generating Organization Preview ---")
+        for warning in self.rule_plan_warnings:
+            self.log(f"  - WARN: {warning}")
+        overlaps = self.describe_category_overlaps()
+        if overlaps:
+            self.log(f"Category precedence for shared extensions: {'; '.join(overlaps)}")
         if is_recursive:
-            self.log_message.emit("Scanning subfolders (recursive)...")
+            self.log("Scanning subfolders (recursive)...")
         else:
-            self.log_message.emit("Scanning root folder (non-recursive)...")
+            self.log("Scanning root folder (non-recursive)...")
 
-        items_to_scan = []
-        category_folders = [d.lower() for d in self.categories.keys()]
+        category_folders = {d.lower() for d in self.categories.keys()}
 
         try:
-            for root, dirs, files in os.walk(path, topdown=True):
-                # --- Pruning logic ---
-                # If we are in the root folder, prune category dirs
-                if os.path.normpath(root) == os.path.normpath(path):
-                    dirs[:] = [d for d in dirs if d.lower() not in category_folders]
-                # If we are *not* in the root folder (i.e., a subfolder)
-                else:
-                    # Check if this subfolder is a category folder (shouldn't happen if pruning worked, but safe)
-                    rel_path = os.path.relpath(root, path)
-                    first_level_dir = rel_path.split(os.path.sep)[0]
-                    if first_level_dir.lower() in category_folders:
-                        dirs[:] = []  # Don't descend further
-                        files = []  # Don't process files in this dir
-
-                # --- Add files to list ---
-                for f in files:
-                    if not f.startswith(".") and f != LOG_FILE_NAME and not f.startswith("~$"):
-                        items_to_scan.append(os.path.join(root, f))
-
-                # --- Non-recursive check ---
-                if not is_recursive:
-                    break  # Stop after processing root folder
-
+            # Category folders at the top level are pruned so organized files aren't re-processed
+            snapshot = TreeSnapshot.scan(path, recursive=is_recursive, skip_root_dirs=category_folders)
         except OSError as exc:
-            self.log_message.emit(f"Error scanning folder: {exc}")
+            self.log(f"Error scanning folder: {exc}")
             self.finished.emit()
             return
 
+        items_to_scan = [entry for entry in snapshot.visible_files() if not entry.name.startswith("~$")]
+
         # --- This point is reached after scanning ---
 
         total_items = len(items_to_scan)
         if total_items == 0:
-            self.log_message.emit("No files to preview.")
+            self.log("No files to preview.")
             self.finished.emit()
             return
 
-        self.log_message.emit(f"Found {total_items} files. Generating preview...")
-        proposed_actions = []
+        self.log(f"Found {total_items} files. Generating preview...")
+        proposed_actions = PreviewRows()
         move_log_temp = {}
-
-        for i, item_path in enumerate(items_to_scan):  # Changed from name to item_path
-
-            action_type, dest_rel_path_or_dir, new_name = self.determine_destination_and_action(item_path)
+        index = self._open_file_index(path)
+        progress = ProgressReporter(self, "Previewing", total_items)
+        namespace = DestinationNamespace()
+
+        for i, (entry, file_cache) in enumerate(self._iter_prepared_files(items_to_scan, index)):
+            if self.cancelled():
+                break
+            progress.advance()  # Counted up front: several paths below skip the file with `continue`
+            item_path = entry.path
+            self.file_metadata_cache[item_path] = file_cache
+            action_type, dest_rel_path_or_dir, new_name = self.determine_destination_and_action(item_path, entry)
+            # Results are persisted, so the in-memory cache only needs to hold the current file
+            self.file_metadata_cache.pop(item_path, None)
+            self._release_file_cache(file_cache)
+            if index:
+                try:
+                    index.store(entry, file_cache)
+                except sqlite3.Error as exc:
+                    self.log(f"  - WARN: File index disabled for this run: {exc}")
+                    index.disable()
 
             final_dest_path = ""
             display_action_detail = ""
@@ -829,95 +2792,182 @@ class Worker(QObject):
                 if is_same_file:  # If file is already in the correct place, skip
                     continue
 
-                target_exists = os.path.exists(final_dest_path)
+                # Taken names include files planned earlier in this batch, not only files on disk
+                target_exists = namespace.exists(final_dest_path)
                 if target_exists:
                     strategy = self.conflict_strategy
                     if strategy == "skip":
                         action_status = "(Skipped - Exists)"
                         final_dest_path = None
                     elif strategy == "rename":
-                        base, ext = os.path.splitext(new_name)
-                        count = 1
-                        temp_dest = final_dest_path
-                        while os.path.exists(temp_dest):
-                            temp_dest = os.path.join(dest_path_dir, f"{base} ({count}){ext}")
-                            count += 1
-                        display_action_detail = os.path.relpath(temp_dest, start=path)
+                        final_dest_path = namespace.reserve_unique(final_dest_path)
+                        display_action_detail = os.path.relpath(final_dest_path, start=path)
                         action_status = "(Renamed - Conflict)"
-                        final_dest_path = temp_dest
                     # REMOVED: Overwrite logic
+                else:
+                    namespace.reserve(final_dest_path)
 
             if final_dest_path:
-                proposed_actions.append((action_type, item_path, f"{display_action_detail} {action_status}"))
+                proposed_actions.append(action_type, item_path, display_action_detail, action_status)
                 move_log_temp[final_dest_path] = (item_path, action_type)  # Store action type
+        progress.finish()
 
-            # Update progress bar periodically
-            if (i + 1) % 100 == 0 or (i + 1) == total_items:
-                self.progress_updated.emit(i + 1, total_items)
+        if index:
+            try:
+                index.prune({entry.path for entry in items_to_scan}, is_recursive)
+                index.close()
+                self.log(f"File index: {index.hits} unchanged, {index.misses} new or modified.")
+            except sqlite3.Error as exc:
+                self.log(f"  - WARN: Could not update file index: {exc}")
+
+        if self.planner_stats["content"] or self.planner_stats["metadata"]:
+            self.log(
+                f"Rule planner: avoided {self.planner_stats['content']} content scans and "
+                f"{self.planner_stats['metadata']} metadata reads by checking cheaper conditions first."
+            )
 
-        self.log_message.emit("--- Preview Generated ---")
+        if self.cancelled():
+            # Analysed files are in the file index, so the next preview skips straight past them
+            self.log(f"--- Preview Cancelled after {progress.done} of {total_items} files. ---")
+            self.finished.emit()
+            return
+        self.log("--- Preview Generated ---")
         self.organization_preview_ready.emit(proposed_actions, move_log_temp, backup_first)
 
     @Slot(str, dict, bool)
     def execute_organization_moves(self, path, move_log_data, backup_first):
         """Executes the actual file moves, copies, renames, and deletes after preview approval."""
-        self.log_message.emit("--- Starting Organization ---")
+        self._start_job()
+        self.log("--- Starting Organization ---")
         if backup_first:
             # ... (backup logic remains the same) ...
-            self.log_message.emit("Creating backup archive...")
+            self.log("Creating backup archive...")
             backup_name = f"organizer_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip"
             backup_path = os.path.join(os.path.dirname(path), backup_name)
             try:
                 with zipfile.ZipFile(backup_path, "w", zipfile.ZIP_DEFLATED) as zipf:
                     for root, dirs, files in os.walk(path):
-                        # Exclude log file from backup
-                        if LOG_FILE_NAME in files:
-                            files.remove(LOG_FILE_NAME)
+                        # Exclude log file, journal and file index from backup
+                        files = [f for f in files if f not in (LOG_FILE_NAME, JOURNAL_FILE_NAME) and not f.startswith(INDEX_FILE_NAME)]
                         # Exclude empty dirs potentially? (optional)
                         for file in files:
                             file_full_path = os.path.join(root, file)
                             arcname = os.path.relpath(file_full_path, path)
                             zipf.write(file_full_path, arcname)
-                self.log_message.emit(f"Backup created: {backup_path}")
+                self.log(f"Backup created: {backup_path}")
             except Exception as exc:
-                self.log_message.emit(f"  - ERROR creating backup: {exc}")
+                self.log(f"  - ERROR creating backup: {exc}")
 
-        total_items = len(move_log_data)
-        items_processed = 0
-        actual_move_log = {}
+        operations = [
+            (op_id, final_dest_or_original, item_path, action_type)
+            for op_id, (final_dest_or_original, (item_path, action_type)) in enumerate(move_log_data.items())
+        ]
+        started = time.perf_counter()
+        journal = OperationJournal(path)
+        journal.start(operations)
+        actual_move_log = self._execute_plan(path, operations, journal)
+        if self.cancelled():
+            self._keep_journal(journal, len(actual_move_log), len(operations))
+        else:
+            self._finish_journaled_run(path, journal, actual_move_log, started)
+            self.log("--- Organization Complete! ---")
+        self.finished.emit()
 
-        for final_dest_or_original, (item_path, action_type) in move_log_data.items():
-            try:
-                if action_type == "delete":
-                    os.remove(item_path)
-                    actual_move_log[f"deleted_{items_processed}"] = {"original": item_path, "action": "delete"}  # Log deletion
-                    self.log_message.emit(f"Deleted '{os.path.relpath(item_path, path)}'")
-
-                elif action_type == "move" or action_type == "rename":
-                    dest_path_dir = os.path.dirname(final_dest_or_original)
-                    if not os.path.exists(dest_path_dir):
-                        os.makedirs(dest_path_dir)
-                    shutil.move(item_path, final_dest_or_original)
-                    actual_move_log[final_dest_or_original] = {"original": item_path, "action": action_type}  # Log action
-                    if action_type == "move":
-                        self.log_message.emit(f"Moved '{os.path.relpath(item_path, path)}' -> '{os.path.relpath(final_dest_or_original, path)}'")
-                    else:
-                        self.log_message.emit(f"Renamed '{os.path.relpath(item_path, path)}' -> '{os.path.relpath(final_dest_or_original, path)}'")
+    @Slot(str, bool)
+    def resume_organization(self, path, finish_remaining):
+        """Picks up an interrupted run from its journal in `path`.
 
-                elif action_type == "copy":
-                    dest_path_dir = os.path.dirname(final_dest_or_original)
-                    if not os.path.exists(dest_path_dir):
-                        os.makedirs(dest_path_dir)
-                    shutil.copy2(item_path, final_dest_or_original)  # copy2 preserves metadata
-                    actual_move_log[final_dest_or_original] = {"original": item_path, "action": action_type}  # Log action
-                    self.log_message.emit(f"Copied '{os.path.relpath(item_path, path)}' -> '{os.path.relpath(final_dest_or_original, path)}'")
+        Operations the journal shows as done, or whose result is on disk, go into the undo log.
+        With `finish_remaining`, the others are carried out; without it they're dropped and only
+        the undo log of what was done is saved.
+        """
+        self._start_job()
+        self.log("--- Resuming Interrupted Organization ---")
+        if self._resume_journaled_run(path, finish_remaining):
+            self.log("--- Organization Complete! ---")
+        self.finished.emit()
 
-            except Exception as exc:
-                self.log_message.emit(f"  - ERROR {action_type}ing '{os.path.basename(item_path)}': {exc}")
+    def _resume_journaled_run(self, path, finish_remaining):
+        """Does the work of resume_organization; returns True once the run is wrapped up."""
+        try:
+            plan, begun, settled = OperationJournal.load(path)
+        except OSError as exc:
+            self.log(f"ERROR: Could not read journal '{JOURNAL_FILE_NAME}': {exc}")
+            return False
 
-            items_processed += 1
-            self.progress_updated.emit(items_processed, total_items)
+        actual_move_log = {}
+        pending = []
+        for operation in plan:
+            op_id, dest, item_path, action_type = operation
+            state = settled.get(op_id) or self._journaled_state(operation, op_id in begun)
+            if state == "done":
+                key = f"deleted_{op_id}" if action_type == "delete" else dest
+                actual_move_log[key] = {"original": item_path, "action": action_type}
+            elif state == "pending":
+                pending.append(operation)
+            elif state != "failed":
+                self.log(f"  - WARN: Skipping '{os.path.basename(item_path)}': {state}")
+        self.log(f"Journal: {len(actual_move_log)} of {len(plan)} operations were done, {len(pending)} remaining.")
+
+        started = time.perf_counter()
+        journal = OperationJournal(path)
+        journal.reopen()
+        if finish_remaining and pending:
+            actual_move_log.update(self._execute_plan(path, pending, journal))
+            if self.cancelled():
+                self._keep_journal(journal, len(actual_move_log), len(plan))
+                return False
+        self._finish_journaled_run(path, journal, actual_move_log, started)
+        return True
+
+    def _keep_journal(self, journal, done, total):
+        """Ends a cancelled run, leaving its journal for resume or revert."""
+        journal.close()
+        self.log(
+            f"--- Organization Cancelled: {done} of {total} operations done. Select the folder again "
+            "to finish the run, or Revert to undo it. ---"
+        )
+
+    def _journaled_state(self, operation, was_begun):
+        """Works out from the disk what became of an operation without a done/failed record.
+
+        Returns "done", "pending" (still to do) or a reason to skip it. Renames are atomic and
+        transfers only rename complete copies into place, so an existing destination is never
+        a partial copy: it's removed only if it is our finished copy. The only file deleted on
+        the way is a begun transfer's own partial_path() leftover.
+        """
+        _op_id, dest, item_path, action_type = operation
+        source_exists = os.path.lexists(item_path)
+        if action_type == "delete":
+            return "pending" if source_exists else "done"
+        if was_begun:
+            try:
+                os.remove(partial_path(dest))
+            except FileNotFoundError:
+                pass
+            except OSError as exc:
+                return f"could not remove partial copy: {exc}"
+        dest_exists = os.path.lexists(dest)
+        if not source_exists:
+            if dest_exists and action_type != "copy":
+                return "done"
+            return "source no longer exists"
+        if not dest_exists:
+            return "pending"
+        try:
+            if os.path.samefile(item_path, dest):
+                return "pending"  # e.g. a case-only rename on a case-insensitive filesystem
+            # A transfer that finished copying but died before removing its source leaves an identical copy
+            if not (was_begun and files_identical(item_path, dest)):
+                return "destination was taken since the plan was made"
+            if action_type != "copy":
+                os.remove(item_path)
+        except OSError as exc:
+            return f"could not check destination: {exc}"
+        return "done"
 
+    def _finish_journaled_run(self, path, journal, actual_move_log, started):
+        """Saves the undo log, then drops the journal and reports what journaling cost the run."""
         if actual_move_log:
             try:
                 # Save log with timestamp (basic history, replace previous)
@@ -926,17 +2976,220 @@ class Worker(QObject):
                 with open(os.path.join(path, LOG_FILE_NAME), "w") as f:
                     json.dump(actual_move_log, f, indent=4)
             except IOError as exc:
-                self.log_message.emit(f"  - ERROR writing log file: {exc}")
+                self.log(f"  - ERROR writing log file: {exc}")
+                journal.close()  # Keep the journal: it's the only record of what was done
+                return
+        journal.finish()
+        elapsed = time.perf_counter() - started
+        if journal.error:
+            self.log(f"  - WARN: Journal disabled after a write error: {journal.error}")
+        elif elapsed > 0:
+            self.log(
+                f"Journal: {journal.records} records, {journal.seconds * 1000:.0f} ms "
+                f"({100 * journal.seconds / elapsed:.1f}% of {elapsed:.1f} s)."
+            )
 
-        self.log_message.emit("--- Organization Complete! ---")
-        self.finished.emit()
+    def _execute_plan(self, path, operations, journal):
+        """Carries out an approved plan and returns the undo log of what was done.
+
+        `operations` are (op id, destination or original, source, action) tuples, each recorded
+        in `journal` as it begins and ends. All destination folders are created once up front.
+        Moves and renames within a device are plain renames done in a tight loop; copies and
+        cross-device moves, which transfer data, run on a thread pool with at most
+        'copy_workers_per_device' transfers touching any one device at a time. Transfers are
+        submitted through a window of twice the pool size and journaled as begun only when
+        submitted, so a cancelled run leaves just that window begun. Cross-device moves are
+        checked before the source is removed, as set by 'verify_cross_device_moves'.
+
+        The plan runs in three phases: deletions, then same-device renames, then pooled
+        transfers, so deletions free their names before anything moves. Each phase keeps plan
+        order, and so does the undo log; only the pooled phase's log lines appear in the order
+        the transfers finish.
+        """
+        progress = ProgressReporter(self, "Organizing", len(operations))
+        actual_move_log = {}
+        deletes = []  # (op id, path)
+        transfers = []  # (op id, destination, source, action type)
+        for op_id, final_dest_or_original, item_path, action_type in operations:
+            if action_type == "delete":
+                deletes.append((op_id, item_path))
+            elif action_type in ("move", "rename", "copy"):
+                transfers.append((op_id, final_dest_or_original, item_path, action_type))
+
+        for op_id, item_path in journal.begun(deletes):
+            if self.cancelled():
+                return actual_move_log
+            try:
+                os.remove(item_path)
+                actual_move_log[f"deleted_{op_id}"] = {"original": item_path, "action": "delete"}  # Log deletion
+                journal.done(op_id)
+                self.log(f"Deleted '{os.path.relpath(item_path, path)}'")
+            except Exception as exc:
+                journal.failed(op_id, exc)
+                self.log(f"  - ERROR deleting '{os.path.basename(item_path)}': {exc}")
+            progress.advance()
+
+        # Destination folders, once each; remember their devices for the rename/copy split
+        folder_devices = {}
+        for folder in sorted({os.path.dirname(dest) for _op_id, dest, _src, _action in transfers}):
+            try:
+                os.makedirs(folder, exist_ok=True)
+                folder_devices[folder] = os.stat(folder).st_dev
+            except OSError as exc:
+                self.log(f"  - ERROR creating folder '{os.path.relpath(folder, path)}': {exc}")
+
+        # Verified cross-device moves hash the data as it is copied; the digests go to the hash cache
+        verify_mode = self._move_verification()
+        verify_algorithm = self._hash_algorithm() if verify_mode in ("full", "readback") else None
+        hash_cache = None
+        if verify_algorithm and any(action_type != "copy" for *_rest, action_type in transfers):
+            hash_cache = self._open_hash_cache(verify_algorithm)
+        renames = []
+        pooled = []  # (op id, destination, source, action type, source device, destination device)
+        source_devices = {}
+        for op_id, dest, item_path, action_type in transfers:
+            dest_device = folder_devices.get(os.path.dirname(dest))
+            source_folder = os.path.dirname(item_path)
+            if source_folder not in source_devices:
+                try:
+                    source_devices[source_folder] = os.stat(source_folder).st_dev
+                except OSError:
+                    source_devices[source_folder] = None
+            source_device = source_devices[source_folder]
+            if dest_device is None or source_device is None:
+                journal.failed(op_id, "destination or source folder unavailable")
+                self.log(f"  - ERROR {action_type}ing '{os.path.basename(item_path)}': destination or source folder unavailable")
+                progress.advance()
+            elif action_type != "copy" and source_device == dest_device:
+                renames.append((op_id, dest, item_path, action_type))
+            else:
+                pooled.append((op_id, dest, item_path, action_type, source_device, dest_device))
+
+        for op_id, dest, item_path, action_type in journal.begun(renames):
+            if self.cancelled():
+                break
+            try:
+                try:
+                    os.rename(item_path, dest)
+                except OSError as exc:
+                    if exc.errno != errno.EXDEV:  # e.g. separate bind mounts of one filesystem
+                        raise
+                    _size, digest = transfer_file(
+                        item_path, dest, action_type, verify_algorithm=verify_algorithm, verify_mode=verify_mode
+                    )
+                    self._remember_digest(hash_cache, dest, digest)
+                actual_move_log[dest] = {"original": item_path, "action": action_type}  # Log action
+                journal.done(op_id)
+                verb = "Moved" if action_type == "move" else "Renamed"
+                self.log(f"{verb} '{os.path.relpath(item_path, path)}' -> '{os.path.relpath(dest, path)}'")
+            except Exception as exc:
+                journal.failed(op_id, exc)
+                self.log(f"  - ERROR {action_type}ing '{os.path.basename(item_path)}': {exc}")
+            progress.advance()
+
+        if pooled and not self.cancelled():
+            pooled_log = {}  # op id -> (destination, undo entry); added to the undo log in plan order
+            per_device = self._copy_workers_per_device()
+            devices = {device for item in pooled for device in item[4:]}
+            limits = {device: threading.Semaphore(per_device) for device in devices}
+            workers = per_device * len(devices)
+            jobs = iter(pooled)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                # A bounded window of jobs is in flight, each journaled as begun when it's submitted
+                futures = {}
+                while True:
+                    if not self.cancelled():
+                        batch = list(itertools.islice(jobs, workers * 2 - len(futures)))
+                        journal.begin(op_id for op_id, *_rest in batch)
+                        for op_id, dest, item_path, action_type, src_dev, dest_dev in batch:
+                            future = pool.submit(
+                                self._unless_cancelled,
+                                transfer_file,
+                                item_path,
+                                dest,
+                                action_type,
+                                [limits[d] for d in sorted({src_dev, dest_dev})],
+                                verify_algorithm,
+                                verify_mode,
+                            )
+                            futures[future] = (op_id, dest, item_path, action_type)
+                    if not futures:
+                        break
+                    done, _not_done = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        op_id, dest, item_path, action_type = futures.pop(future)
+                        try:
+                            result = future.result()
+                            if result is None:
+                                continue  # Not started before the run was cancelled
+                            copied_bytes, digest = result
+                            self._remember_digest(hash_cache, dest, digest)
+                        except Exception as exc:
+                            journal.failed(op_id, exc)
+                            self.log(f"  - ERROR {action_type}ing '{os.path.basename(item_path)}': {exc}")
+                            progress.advance()
+                            continue
+                        pooled_log[op_id] = (dest, {"original": item_path, "action": action_type})
+                        journal.done(op_id)
+                        verb = {"move": "Moved", "rename": "Renamed", "copy": "Copied"}[action_type]
+                        self.log(f"{verb} '{os.path.relpath(item_path, path)}' -> '{os.path.relpath(dest, path)}'")
+                        progress.advance(nbytes=copied_bytes)
+            for op_id in sorted(pooled_log):
+                dest, entry = pooled_log[op_id]
+                actual_move_log[dest] = entry  # Log action
+        if hash_cache:
+            try:
+                hash_cache.close()
+            except sqlite3.Error as exc:
+                self.log(f"  - WARN: Could not update hash cache: {exc}")
+        return actual_move_log
+
+    def _unless_cancelled(self, func, *args):
+        """Pool job wrapper: waits while the job is paused; once it's cancelled, skips func and returns None."""
+        if self.cancelled():
+            return None
+        return func(*args)
+
+    def _remember_digest(self, hash_cache, file_path, digest):
+        """Stores the full digest of a file just written, so duplicate scans needn't read it."""
+        if hash_cache is None or digest is None:
+            return
+        try:
+            hash_cache.store(FileEntry.from_path(file_path), "full", digest)
+        except (OSError, sqlite3.Error):
+            pass  # The file is in place either way; a later scan just hashes it again
+
+    def _move_verification(self):
+        """'verify_cross_device_moves' as "full", "readback", "sampled" or "off" (true/false from older settings: full/off)."""
+        mode = self.performance.get("verify_cross_device_moves", PERFORMANCE_DEFAULTS["verify_cross_device_moves"])
+        if isinstance(mode, bool):
+            return "full" if mode else "off"
+        mode = str(mode).lower()
+        if mode not in ("full", "readback", "sampled", "off"):
+            self.log(f"  - WARN: Unknown move verification '{mode}', using full.")
+            mode = "full"
+        return mode
+
+    def _copy_workers_per_device(self):
+        try:
+            configured = int(self.performance.get("copy_workers_per_device", PERFORMANCE_DEFAULTS["copy_workers_per_device"]))
+        except (TypeError, ValueError):
+            configured = PERFORMANCE_DEFAULTS["copy_workers_per_device"]
+        return max(1, configured)
 
     @Slot(str)
     def run_deorganization(self, path):
-        self.log_message.emit("\n--- Starting De-organization ---")
+        self._start_job()
+        self.log("\n--- Starting De-organization ---")
+        if os.path.exists(os.path.join(path, JOURNAL_FILE_NAME)):
+            # An interrupted run is reverted from its journal: save its undo log first
+            self.log("Saving the undo log of the interrupted organization run...")
+            if not self._resume_journaled_run(path, False):
+                self.finished.emit()
+                return
         log_path = os.path.join(path, LOG_FILE_NAME)
         if not os.path.exists(log_path):
-            self.log_message.emit("ERROR: Log file not found.")
+            self.log("ERROR: Log file not found.")
             self.finished.emit()
             return
 
@@ -945,11 +3198,16 @@ class Worker(QObject):
                 move_log = json.load(f)
             total = len(move_log)
             items_processed = 0
+            progress = ProgressReporter(self, "Restoring", total)
 
             # --- Iterate in reverse for potentially safer directory handling ---
             organized_paths = list(move_log.keys())
+            cancelled_at = None
 
-            for key in organized_paths:  # Use key to handle deletion logs
+            for position, key in enumerate(organized_paths):  # Use key to handle deletion logs
+                if self.cancelled():
+                    cancelled_at = position
+                    break
                 log_entry = move_log[key]
 
                 # --- Handle potential old log format ---
@@ -965,11 +3223,11 @@ class Worker(QObject):
                 items_processed += 1
 
                 if action_type == "delete":
-                    self.log_message.emit(f"  - SKIPPED Revert: Cannot undo deletion of '{os.path.basename(original)}'")
+                    self.log(f"  - SKIPPED Revert: Cannot undo deletion of '{os.path.basename(original)}'")
                     continue  # Cannot revert deletion
 
                 if not organized or not original:
-                    self.log_message.emit(f"  - WARN: Invalid log entry skipped: {key}")
+                    self.log(f"  - WARN: Invalid log entry skipped: {key}")
                     continue
 
                 if os.path.exists(organized):
@@ -987,7 +3245,7 @@ class Worker(QObject):
                             while os.path.exists(new_original):
                                 count += 1
                                 new_original = os.path.join(original_dir, f"{base} (restored {count}){ext}")
-                            self.log_message.emit(
+                            self.log(
                                 f"  - WARN: Original exists, renaming restored file to {os.path.basename(new_original)}"
                             )
                             restored_original_path = new_original
@@ -995,20 +3253,20 @@ class Worker(QObject):
                         # Only move back if it was moved or renamed originally
                         if action_type == "move" or action_type == "rename":
                             shutil.move(organized, restored_original_path)
-                            self.log_message.emit(f"'{os.path.basename(restored_original_path)}' <- Moved back")
+                            self.log(f"'{os.path.basename(restored_original_path)}' <- Moved back")
                         elif action_type == "copy":
                             # Optionally delete the copied file? For now, just log.
-                            self.log_message.emit(
+                            self.log(
                                 f"  - INFO: Original action was 'copy', leaving '{os.path.basename(organized)}' in place."
                             )
 
                     except Exception as exc:
-                        self.log_message.emit(f"  - ERROR moving back '{os.path.basename(organized)}': {exc}")
+                        self.log(f"  - ERROR moving back '{os.path.basename(organized)}': {exc}")
 
                 elif action_type != "delete":  # Don't warn if a deleted file isn't found
-                    self.log_message.emit(f"  - WARN: Organized file not found, skipping: {organized}")
+                    self.log(f"  - WARN: Organized file not found, skipping: {organized}")
 
-                self.progress_updated.emit(items_processed, total)
+                progress.advance()
 
             # --- Cleanup empty directories (same logic as before) ---
             organized_dirs = set()
@@ -1022,55 +3280,324 @@ class Worker(QObject):
                     # Check if exists and is empty AFTER all moves
                     if os.path.exists(org_dir) and not os.listdir(org_dir) and os.path.normpath(org_dir) != os.path.normpath(path):
                         os.rmdir(org_dir)
-                        self.log_message.emit(f"Removed empty directory: {os.path.basename(org_dir)}")
+                        self.log(f"Removed empty directory: {os.path.basename(org_dir)}")
                 except OSError as exc:
-                    self.log_message.emit(f"  - WARN: Could not remove dir {os.path.basename(org_dir)}: {exc}")
-
+                    self.log(f"  - WARN: Could not remove dir {os.path.basename(org_dir)}: {exc}")
+
+            if cancelled_at is not None:
+                # Keep what's left to restore, so Revert picks up where this run stopped
+                remaining = {key: move_log[key] for key in organized_paths[cancelled_at:]}
+                with open(log_path, "w") as f:
+                    json.dump(remaining, f, indent=4)
+                self.log(f"--- De-organization Cancelled: {len(remaining)} entries left; Revert again to continue. ---")
+                return
             os.remove(log_path)
-            self.log_message.emit("Removed log file.")
-            self.log_message.emit("--- De-organization Complete! ---")
+            self.log("Removed log file.")
+            self.log("--- De-organization Complete! ---")
 
         except json.JSONDecodeError:
-            self.log_message.emit(f"ERROR: Could not read log file '{LOG_FILE_NAME}'.")
+            self.log(f"ERROR: Could not read log file '{LOG_FILE_NAME}'.")
         except Exception as exc:
-            self.log_message.emit(f"An unexpected error occurred: {exc}")
+            self.log(f"An unexpected error occurred: {exc}")
         finally:
             self.finished.emit()
 
-    @Slot(str)
-    def run_duplicate_scan(self, path):
-        # ... (duplicate scan logic remains the same) ...
-        self.log_message.emit("--- Starting Duplicate File Scan ---")
-        hashes = {}
-        file_list = []
-        for root, _, files in os.walk(path):
-            for file in files:
-                if not file.startswith(".") and file != LOG_FILE_NAME:
-                    file_list.append(os.path.join(root, file))
-        total = len(file_list)
-        if total == 0:
-            self.log_message.emit("No files found to scan.")
+    @Slot(str, str)
+    def run_duplicate_scan(self, path, mode=DUPLICATE_MODE_EXACT):
+        """Finds sets of duplicate files under `path` and emits them as {group key: [FileEntry]}.
+
+        Exact scans also emit the sets of paths that are already hard links to one file; the
+        dialog lists them separately, since they can't be reclaimed.
+
+        `mode` is DUPLICATE_MODE_EXACT (identical content), DUPLICATE_MODE_IMAGES (visually
+        similar images, e.g. resized or re-encoded copies) or DUPLICATE_MODE_DOCUMENTS
+        (documents with mostly the same text, e.g. re-exports or drafts).
+        """
+        self._start_job()
+        self.log(f"--- Starting Duplicate File Scan ({mode}) ---")
+        try:
+            entries = TreeSnapshot.scan(path).visible_files()
+        except OSError as exc:
+            self.log(f"Error scanning folder: {exc}")
+            entries = []
+        if not entries:
+            self.log("No files found to scan.")
+            self.finished.emit()
+            return
+
+        linked = []
+        try:
+            if mode == DUPLICATE_MODE_IMAGES:
+                duplicates = self._find_similar_images(entries)
+            elif mode == DUPLICATE_MODE_DOCUMENTS:
+                duplicates = self._find_similar_documents(entries)
+            else:
+                duplicates, linked = self._find_exact_duplicates(entries)
+        except Exception as exc:
+            self.log(f"An unexpected error occurred: {exc}")
             self.finished.emit()
             return
-        processed_files = 0
-        for filepath in file_list:
+        if self.cancelled():
+            # Sets found among the files compared so far are real duplicates; they're offered as usual
+            self.log(f"--- Duplicate Scan Cancelled: Found {len(duplicates)} sets among the files compared so far. ---")
+        else:
+            self.log(f"--- Duplicate Scan Complete: Found {len(duplicates)} sets of duplicates. ---")
+        self.duplicate_scan_finished.emit(duplicates, linked)
+
+    @Slot(list, str)
+    def process_duplicates(self, pairs, mode):
+        """Deletes ('delete') or links ('hardlink'/'reflink') the duplicates of [keep, duplicate] pairs."""
+        self._start_job()
+        verb = "Deleting" if mode == "delete" else f"Replacing with {mode}s"
+        self.log(f"--- {verb}: {len(pairs)} duplicate files ---")
+        done = failed = reclaimed = 0
+        progress = ProgressReporter(self, verb, len(pairs))
+        for keep, duplicate in pairs:
+            if self.cancelled():
+                break
             try:
-                hasher = hashlib.md5()
-                with open(filepath, "rb") as f:
-                    while chunk := f.read(8192 * 16):
-                        hasher.update(chunk)
-                file_hash = hasher.hexdigest()
-                if file_hash in hashes:
-                    hashes[file_hash].append(filepath)
+                if mode == "delete":
+                    size = os.path.getsize(duplicate)
+                    os.remove(duplicate)
+                    reclaimed += size
                 else:
-                    hashes[file_hash] = [filepath]
-            except (IOError, OSError) as exc:
-                self.log_message.emit(f"Could not read {os.path.basename(filepath)}: {exc}")
-            processed_files += 1
-            self.progress_updated.emit(processed_files, total)
-        duplicates = {hash_val: files for hash_val, files in hashes.items() if len(files) > 1}
-        self.log_message.emit(f"--- Duplicate Scan Complete: Found {len(duplicates)} sets of duplicates. ---")
-        self.duplicate_scan_finished.emit(duplicates)
+                    reclaimed += link_duplicate(keep, duplicate, mode)
+                done += 1
+            except OSError as exc:
+                failed += 1
+                self.log(f"  - ERROR: {os.path.basename(duplicate)}: {exc}")
+            progress.advance()
+        action = "removed" if mode == "delete" else "linked"
+        summary = f"{done} files {action}, {reclaimed / (1024 * 1024):.1f} MB reclaimed"
+        if failed:
+            summary += f", {failed} failed"
+        if self.cancelled():
+            summary += f", {len(pairs) - done - failed} skipped (cancelled)"
+        self.log(f"--- Duplicate cleanup complete ({summary}). ---")
+        self.duplicates_processed.emit(f"Duplicates: {summary}.")
+        self.finished.emit()
+
+    def _find_exact_duplicates(self, entries):
+        """Groups files with identical content, reading as little of the tree as possible.
+
+        Only files sharing a size can be duplicates. Same-size files are split by a hash of
+        their first and last 64 KB, and only those that still collide are hashed in full.
+        Hashing runs on a thread pool. Returns ({full digest: [entries]}, linked), where linked
+        lists the sets of paths that are hard links to one file: they're reported on their own,
+        not as duplicates, since linking them again frees nothing.
+        """
+        # 0. Hard links share their content: hash each (dev, inode) once, through its first path
+        inodes = {}
+        unique = []
+        for entry in entries:
+            key = (entry.dev, entry.inode) if entry.inode else entry
+            if key in inodes:
+                inodes[key].append(entry.path)
+            else:
+                inodes[key] = [entry.path]
+                unique.append(entry)
+        linked = [paths for paths in inodes.values() if len(paths) > 1]
+        if linked:
+            self.log(f"{len(linked)} sets of paths are already hard-linked (listed separately, not as duplicates).")
+        entries = unique
+
+        # 1. Size buckets, straight from the snapshot's stat data
+        size_groups = group_by(entries, lambda entry: entry.size)
+        candidates = sum(len(group) for group in size_groups)
+        total_bytes = sum(entry.size for entry in entries)
+        self.log(f"{candidates} of {len(entries)} files share a size with another file.")
+
+        algorithm = self._hash_algorithm()
+        workers = self._hash_worker_count()
+        self.log(f"Hashing with {algorithm} on {workers} thread(s).")
+        bytes_read = 0
+        small = []
+        edge_entries = []
+        for group in size_groups:
+            # Small files: the head and tail cover the whole file, so hash them fully right away
+            (small if group[0].size <= 2 * DUPLICATE_EDGE_BYTES else edge_entries).extend(group)
+
+        cache = self._open_hash_cache(algorithm)
+        with HashEngine(algorithm, workers) as engine:
+            # 2. Head/tail hash of each same-size candidate
+            partial, read = self._hash_entries(engine, "partial", edge_entries, cache, phase="Comparing file edges")
+            bytes_read += 2 * DUPLICATE_EDGE_BYTES * len(read)
+            to_full_hash = small + [
+                entry
+                for collision in group_by(
+                    (entry for entry in edge_entries if entry in partial), lambda entry: (entry.size, partial[entry])
+                )
+                for entry in collision
+            ]
+
+            # 3. Full hash of the files that still collide
+            full, read = self._hash_entries(engine, "full", to_full_hash, cache, phase="Hashing")
+            bytes_read += sum(entry.size for entry in read)
+        if cache:
+            self._close_hash_cache(cache)
+
+        hashes = {}  # Full hash -> [entries], in walk order
+        for entry in entries:
+            if entry in full:
+                hashes.setdefault(full[entry], []).append(entry)
+
+        if total_bytes:
+            self.log(
+                f"Read {bytes_read / (1024 * 1024):.1f} MB of {total_bytes / (1024 * 1024):.1f} MB "
+                f"({100 * bytes_read / total_bytes:.1f}%) to compare {len(to_full_hash)} files in full."
+            )
+        return {hash_val: files for hash_val, files in hashes.items() if len(files) > 1}, linked
+
+    def _find_similar_images(self, entries):
+        """Groups images whose perceptual hashes are within 'image_similarity_distance' bits.
+
+        dHashes are computed on the hashing thread pool (and kept in the hash cache); a BK-tree
+        finds each image's neighbours without comparing every pair, and neighbours are merged
+        transitively into groups. Returns {"dhash:<hash of first image>": [entries]}.
+        """
+        images = [entry for entry in entries if os.path.splitext(entry.name)[1].lower() in self.image_extensions]
+        self.log(f"Computing perceptual hashes for {len(images)} images...")
+        try:
+            distance = int(self.performance.get("image_similarity_distance", PERFORMANCE_DEFAULTS["image_similarity_distance"]))
+        except (TypeError, ValueError):
+            distance = PERFORMANCE_DEFAULTS["image_similarity_distance"]
+
+        cache = self._open_hash_cache(PERCEPTUAL_HASH_NAME)
+        with HashEngine("md5", self._hash_worker_count()) as engine:
+            hashes, _read = self._hash_entries(
+                engine, "full", images, cache, lambda entry: image_dhash(entry.path), phase="Perceptual hashing"
+            )
+        if cache:
+            self._close_hash_cache(cache)
+
+        tree = BKTree()
+        groups = DisjointSet()
+        for entry in images:  # Walk order, so each group is keyed by its first image
+            if self.cancelled():
+                break
+            value = hashes.get(entry)
+            if value is None:
+                continue
+            value = int(value, 16)
+            for other in tree.search(value, distance):
+                groups.union(other, entry)
+            tree.add(value, entry)
+        duplicates = {}
+        for members in groups.groups():
+            duplicates[f"dhash:{hashes[members[0]]}"] = members
+        return duplicates
+
+    def _find_similar_documents(self, entries):
+        """Groups TXT/PDF/DOCX files whose text is about as similar as 'document_similarity_threshold'.
+
+        Text is extracted within the 'document_similarity_*' budget and reduced to MinHash
+        signatures on a process pool (and kept in the hash cache). Locality-sensitive hashing
+        buckets signatures band by band, so only documents sharing a bucket are compared. Returns {"minhash:<n>": [entries]}.
+        """
+        documents = [entry for entry in entries if os.path.splitext(entry.name)[1].lower() in CONTENT_EXTENSIONS]
+        self.log(f"Computing text signatures for {len(documents)} documents...")
+        try:
+            threshold = float(self.performance.get("document_similarity_threshold", PERFORMANCE_DEFAULTS["document_similarity_threshold"]))
+        except (TypeError, ValueError):
+            threshold = PERFORMANCE_DEFAULTS["document_similarity_threshold"]
+
+        budget = self._similarity_budget()
+        cache = self._open_hash_cache(f"minhash:{budget['max_pages']}:{budget['max_bytes']}:{budget['max_chars']}")
+        with HashEngine("md5", self._metadata_worker_count(), processes=True) as engine:
+            func = functools.partial(document_minhash, budget=budget)
+            hex_signatures, _read = self._hash_entries(engine, "full", documents, cache, func, phase="Extracting text")
+        if cache:
+            self._close_hash_cache(cache)
+
+        signatures = {}
+        for entry in documents:  # Walk order, so each group starts with its first document
+            sig = hex_signatures.get(entry)
+            if sig:
+                signatures[entry] = [int(sig[i : i + 15], 16) for i in range(0, len(sig), 15)]
+        bands, rows = lsh_band_rows(threshold)
+        groups = DisjointSet()
+        compared = set()
+        for band in range(bands):
+            if self.cancelled():
+                break
+            buckets = {}
+            for entry, sig in signatures.items():
+                key = tuple(sig[band * rows : (band + 1) * rows])
+                if all(value == MINHASH_EMPTY for value in key):
+                    continue  # Short texts leave many bins empty; empty bands say nothing
+                buckets.setdefault(key, []).append(entry)
+            for bucket in buckets.values():
+                if self.cancelled():
+                    break
+                for pair in itertools.combinations(bucket, 2):
+                    if pair in compared or groups.find(pair[0]) is groups.find(pair[1]):
+                        continue
+                    compared.add(pair)
+                    if minhash_similarity(signatures[pair[0]], signatures[pair[1]]) >= threshold:
+                        groups.union(*pair)
+        self.log(f"LSH: {bands} bands of {rows} rows, {len(compared)} candidate pairs verified.")
+        return {f"minhash:{n}": members for n, members in enumerate(groups.groups(), 1)}
+
+    def _open_hash_cache(self, algorithm):
+        """Opens the persistent digest cache, or returns None (the scan then hashes everything)."""
+        try:
+            max_entries = int(self.performance.get("hash_cache_max_entries", 0))
+        except (TypeError, ValueError):
+            max_entries = PERFORMANCE_DEFAULTS["hash_cache_max_entries"]
+        if max_entries <= 0:
+            return None
+        try:
+            return HashCache(HASH_CACHE_FILE_NAME, algorithm, max_entries)
+        except sqlite3.Error as exc:
+            self.log(f"  - WARN: Hash cache unavailable, hashing all files: {exc}")
+            return None
+
+    def _close_hash_cache(self, cache):
+        self.log(f"Reused {cache.hits} cached digests.")
+        try:
+            cache.close()
+        except sqlite3.Error as exc:
+            self.log(f"  - WARN: Could not update hash cache: {exc}")
+
+    def _hash_entries(self, engine, kind, entries, cache, func=None, phase="Hashing"):
+        """Gets the 'partial' or 'full' digest of each entry, from the cache or the engine's pool.
+
+        `func(entry)` overrides how a digest is computed. Returns ({entry: digest}, entries
+        actually read); unreadable files are logged and left out.
+        """
+        digests = {}
+        to_read = []
+        for entry in entries:
+            if self.cancelled():
+                return digests, []
+            try:
+                digest = cache.lookup(entry, kind) if cache else None
+            except sqlite3.Error as exc:
+                self.log(f"  - WARN: Hash cache disabled for this scan: {exc}")
+                cache.disable()
+                digest = None
+            if digest is None:
+                to_read.append(entry)
+            else:
+                digests[entry] = digest
+
+        read = []
+        # Digests over file contents read whole files; partial ones the head and tail
+        nbytes = (lambda entry: min(entry.size, 2 * DUPLICATE_EDGE_BYTES)) if kind == "partial" else (lambda entry: entry.size)
+        progress = ProgressReporter(self, phase, len(to_read), sum(nbytes(entry) for entry in to_read))
+        results = engine.run(func or (lambda entry: engine.digest(kind, entry)), to_read)
+        for entry, digest, error in results:
+            if self.cancelled():
+                break
+            if error is None:
+                digests[entry] = digest
+                read.append(entry)
+                if cache:
+                    cache.store(entry, kind, digest)
+            else:
+                self.log(f"Could not read {entry.name}: {error}")
+            progress.advance(nbytes=nbytes(entry))
+        return digests, read
 
     @Slot(str)
     def scan_folder_stats(self, path):
@@ -1080,18 +3607,12 @@ class Worker(QObject):
         size_bytes = 0
         type_counts = {}
         try:
-            for root, _, files in os.walk(path):
-                for file in files:
-                    if not file.startswith(".") and file != LOG_FILE_NAME:
-                        count += 1
-                        filepath = os.path.join(root, file)
-                        try:
-                            size_bytes += os.path.getsize(filepath)
-                        except OSError:
-                            pass
-                        ext = os.path.splitext(file)[1].lower()
-                        if ext:
-                            type_counts[ext] = type_counts.get(ext, 0) + 1
+            for entry in TreeSnapshot.scan(path).visible_files():
+                count += 1
+                size_bytes += entry.size
+                ext = os.path.splitext(entry.name)[1].lower()
+                if ext:
+                    type_counts[ext] = type_counts.get(ext, 0) + 1
 
             # Calculate size string here to avoid int overflow in signal
             size_mb = size_bytes / (1024 * 1024)
@@ -1100,7 +3621,7 @@ class Worker(QObject):
             self.folder_stats_ready.emit(count, size_str, type_counts)  # Pass string
 
         except Exception as exc:
-            self.log_message.emit(f"Error scanning folder stats: {exc}")
+            self.log(f"Error scanning folder stats: {exc}")
         finally:
             self.finished.emit()  # Moved finished emit here
 
@@ -1108,29 +3629,34 @@ class Worker(QObject):
     def run_empty_folder_cleanup(self, path):
         # ... (cleanup logic remains the same) ...
         """Finds and deletes empty subfolders."""
-        self.log_message.emit("--- Scanning for empty folders... ---")
+        self._start_job()
+        self.log("--- Scanning for empty folders... ---")
         folders_removed = 0
         try:
+            snapshot = TreeSnapshot.scan(path)
             # Walk bottom-up to remove child folders first
-            for root, dirs, files in os.walk(path, topdown=False):
+            for root in reversed(snapshot.dir_order):
+                if self.cancelled():
+                    self.log("Cleanup cancelled.")
+                    break
                 # Don't delete the root folder itself
                 if os.path.normpath(root) == os.path.normpath(path):
                     continue
 
-                if not dirs and not files:
+                if snapshot.dir_entry_counts[root] == 0:
                     try:
                         os.rmdir(root)
-                        self.log_message.emit(f"Removed empty folder: {os.path.relpath(root, path)}")
+                        self.log(f"Removed empty folder: {os.path.relpath(root, path)}")
                         folders_removed += 1
                     except OSError as exc:
-                        self.log_message.emit(f"  - WARN: Could not remove {os.path.relpath(root, path)}: {exc}")
+                        self.log(f"  - WARN: Could not remove {os.path.relpath(root, path)}: {exc}")
 
             if folders_removed == 0:
-                self.log_message.emit("No empty folders found.")
+                self.log("No empty folders found.")
             else:
-                self.log_message.emit(f"--- Cleanup complete: {folders_removed} empty folders removed. ---")
+                self.log(f"--- Cleanup complete: {folders_removed} empty folders removed. ---")
         except Exception as exc:
-            self.log_message.emit(f"  - ERROR during cleanup: {exc}")
+            self.log(f"  - ERROR during cleanup: {exc}")
         finally:
             self.finished.emit()
 
@@ -1190,7 +3716,9 @@ class FileOrganizerWindow(QMainWindow):
     start_organization_preview_signal = Signal(str, bool, bool)
     execute_organization_signal = Signal(str, dict, bool)
     start_deorganization_signal = Signal(str)
-    start_duplicate_scan_signal = Signal(str)
+    resume_organization_signal = Signal(str, bool)
+    start_duplicate_scan_signal = Signal(str, str)
+    process_duplicates_signal = Signal(list, str)
     organize_one_file_signal = Signal(str)
     scan_folder_stats_signal = Signal(str)
     start_cleanup_signal = Signal(str)  # Signal for empty folder cleanup
@@ -1204,6 +3732,7 @@ class FileOrganizerWindow(QMainWindow):
         self.setAcceptDrops(True)
         self.watcher = None
         self.watcher_thread = None
+        self.resume_check_folder = None  # Checked for an interrupted run once its stats scan is done
         self.current_theme = "dark"
         self.current_preview_data = {}
         self.central_widget = QWidget(self)
@@ -1268,6 +3797,13 @@ class FileOrganizerWindow(QMainWindow):
         self.duplicates_btn.setToolTip("Find duplicate files")
         self.duplicates_btn.clicked.connect(self.start_duplicate_scan)
         toolbar_layout_row2.addWidget(self.duplicates_btn)
+        self.duplicate_mode_combo = QComboBox()
+        self.duplicate_mode_combo.addItems(DUPLICATE_MODES)
+        self.duplicate_mode_combo.setToolTip(
+            "Exact: identical content. Similar Images: resized/re-encoded copies of a photo. "
+            "Similar Documents: files with mostly the same text"
+        )
+        toolbar_layout_row2.addWidget(self.duplicate_mode_combo)
         self.cleanup_btn = QPushButton(qta.icon("fa5s.broom", color="#e0e0e0"), " Clean Empty")
         self.cleanup_btn.setToolTip("Delete empty subfolders")
         self.cleanup_btn.clicked.connect(self.start_empty_folder_cleanup)
@@ -1358,13 +3894,36 @@ class FileOrganizerWindow(QMainWindow):
         log_tools_layout.addWidget(self.export_log_btn)
         content_layout.addWidget(log_tools_widget)
 
-        self.log_area = QTextEdit()
+        self.log_area = QPlainTextEdit()
         self.log_area.setReadOnly(True)
+        self.log_area.setMaximumBlockCount(LOG_VIEW_MAX_LINES)  # Older lines stay in the activity log
+        self.log_sink = LogSink(ACTIVITY_LOG_FILE_NAME)
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_log)
+        self.log_timer.start(LOG_FLUSH_INTERVAL_MS)
         content_layout.addWidget(self.log_area, 1)
+        progress_layout = QHBoxLayout()
+        progress_layout.setSpacing(8)
         self.progress_bar = QProgressBar()
         self.progress_bar.setValue(0)
         self.progress_bar.setVisible(False)
-        content_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.progress_bar, 1)
+        self.pause_btn = QPushButton(qta.icon("fa5s.pause"), " Pause")
+        self.pause_btn.setToolTip("Pause the running task at its next checkpoint")
+        self.pause_btn.setCheckable(True)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.toggled.connect(self.toggle_pause)
+        progress_layout.addWidget(self.pause_btn)
+        self.cancel_btn = QPushButton(qta.icon("fa5s.stop"), " Cancel")
+        self.cancel_btn.setToolTip("Stop the running task, keeping what it has done so far")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_task)
+        progress_layout.addWidget(self.cancel_btn)
+        content_layout.addLayout(progress_layout)
+        self.progress_label = QLabel()
+        self.progress_label.setObjectName("StatsLabel")
+        self.progress_label.setVisible(False)
+        content_layout.addWidget(self.progress_label)
 
     def create_title_bar(self):
         self.title_bar = QWidget(self)
@@ -1421,10 +3980,11 @@ class FileOrganizerWindow(QMainWindow):
         url = event.mimeData().urls()[0]
         folder_path = url.toLocalFile()
         self.path_input.setText(folder_path)
-        self.log_area.clear()
-        self.log_area.append(f"Selected folder: {folder_path}")
+        self.clear_log()
+        self.append_log(f"Selected folder: {folder_path}")
         if self.watcher and self.watcher.path != folder_path:
             self.watcher_check.setChecked(False)
+        self.resume_check_folder = folder_path
         self.scan_folder_stats_signal.emit(folder_path)
 
     def mousePressEvent(self, event):
@@ -1449,11 +4009,13 @@ class FileOrganizerWindow(QMainWindow):
         self.thread = QThread()
         self.worker = Worker()
         self.worker.moveToThread(self.thread)
-        self.worker.log_message.connect(self.update_log)
+        self.worker.log_sink = self.log_sink
         self.worker.progress_updated.connect(self.update_progress)
+        self.worker.progress_stats.connect(self.update_progress_stats)
         self.worker.finished.connect(self.on_task_finished)
         self.worker.single_file_organized.connect(self.show_tray_notification)
         self.worker.duplicate_scan_finished.connect(self.on_duplicate_scan_finished)
+        self.worker.duplicates_processed.connect(self.on_duplicates_processed)
         self.worker.organization_preview_ready.connect(self.on_organization_preview_ready)
         self.worker.folder_stats_ready.connect(self.on_folder_stats_ready)
 
@@ -1461,8 +4023,10 @@ class FileOrganizerWindow(QMainWindow):
         self.start_organization_preview_signal.connect(self.worker.run_organization_preview)
         self.execute_organization_signal.connect(self.worker.execute_organization_moves)
         self.start_deorganization_signal.connect(self.worker.run_deorganization)
+        self.resume_organization_signal.connect(self.worker.resume_organization)
         self.organize_one_file_signal.connect(self.worker.organize_single_file)
         self.start_duplicate_scan_signal.connect(self.worker.run_duplicate_scan)
+        self.process_duplicates_signal.connect(self.worker.process_duplicates)
         self.scan_folder_stats_signal.connect(self.worker.scan_folder_stats)
         self.start_cleanup_signal.connect(self.worker.run_empty_folder_cleanup)  # Connect cleanup signal
 
@@ -1490,22 +4054,21 @@ class FileOrganizerWindow(QMainWindow):
             self.backup_check.setChecked(settings.get("backup_before_organize", False))
             self.recursive_check.setChecked(settings.get("recursive_scan", False))
 
-            # Pass rules/categories directly to worker
+            # Pass rules/categories to worker, which compiles the rules
             # Use worker's _get_defaults method if needed
-            self.worker.categories = settings.get("categories", self.worker._get_defaults("categories"))
-            self.worker.rules = settings.get("rules", self.worker._get_defaults("rules"))
-            # ADDED: Update worker's has_content_rules flag
-            self.worker.has_content_rules = any(
-                cond.get("type") == "content" for rule in self.worker.rules for cond in rule.get("conditions", [])
+            self.worker.apply_settings(
+                settings.get("categories", self.worker._get_defaults("categories")),
+                settings.get("rules", self.worker._get_defaults("rules")),
             )
+            self.worker.apply_performance_settings(settings.get("performance"))
             self.worker.conflict_strategy = self.conflict_combo.currentText().lower()
 
-            self.log_area.append(f"--- Settings loaded from {os.path.basename(settings_path)} ---")
+            self.append_log(f"--- Settings loaded from {os.path.basename(settings_path)} ---")
 
         except (FileNotFoundError, json.JSONDecodeError) as exc:
-            self.log_area.append(f"--- Could not load settings from {os.path.basename(settings_path)}: {exc} ---")
+            self.append_log(f"--- Could not load settings from {os.path.basename(settings_path)}: {exc} ---")
             if settings_path == SETTINGS_FILE_NAME:  # Only apply defaults if default settings fail
-                self.log_area.append("--- Loading default settings ---")
+                self.append_log("--- Loading default settings ---")
                 self.current_theme = "dark"
                 self.conflict_combo.setCurrentText("Rename")
                 self.backup_check.setChecked(False)
@@ -1533,15 +4096,16 @@ class FileOrganizerWindow(QMainWindow):
         settings_to_save["recursive_scan"] = self.recursive_check.isChecked()
         settings_to_save["rules"] = self.worker.rules
         settings_to_save["categories"] = self.worker.categories
+        settings_to_save["performance"] = self.worker.performance
 
         try:
             # FIX: Ensure settings_path is a string before using os.path.basename
             log_filename = os.path.basename(str(settings_path)) if settings_path else os.path.basename(SETTINGS_FILE_NAME)
             with open(settings_path, "w") as f:
                 json.dump(settings_to_save, f, indent=4)
-            self.log_area.append(f"--- Settings saved to {log_filename} ---")
+            self.append_log(f"--- Settings saved to {log_filename} ---")
         except IOError as exc:
-            self.log_area.append(f"--- ERROR saving settings: {exc} ---")
+            self.append_log(f"--- ERROR saving settings: {exc} ---")
             self.show_error_message(f"Error saving settings: {exc}")
 
         # Ensure worker is in sync, especially if saving the default file
@@ -1612,11 +4176,36 @@ class FileOrganizerWindow(QMainWindow):
         folder = QFileDialog.getExistingDirectory(self, "Select Folder")
         if folder:
             self.path_input.setText(folder)
-            self.log_area.clear()
-            self.log_area.append(f"Selected folder: {folder}")
+            self.clear_log()
+            self.append_log(f"Selected folder: {folder}")
             self.stats_label.setText("Scanning folder...")  # Indicate scanning
+            self.resume_check_folder = folder
             self.scan_folder_stats_signal.emit(folder)  # Trigger scan
 
+    def offer_resume(self, folder):
+        """Offers to pick up an organization run that was interrupted in `folder`.
+
+        Called once the folder's stats scan has finished, so its completion can't re-enable
+        the buttons while the resumed run is going.
+        """
+        if not os.path.exists(os.path.join(folder, JOURNAL_FILE_NAME)):
+            return
+        reply = QMessageBox.question(
+            self,
+            "Resume Organization",
+            "An organization run in this folder was interrupted.\n\n"
+            "Yes: finish the remaining operations.\n"
+            "No: keep what was done and only save its undo log.\n"
+            "Cancel: decide later.",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No | QMessageBox.StandardButton.Cancel,
+        )
+        if reply == QMessageBox.StandardButton.Cancel:
+            return
+        self.set_buttons_enabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, 0)
+        self.resume_organization_signal.emit(folder, reply == QMessageBox.StandardButton.Yes)
+
     def start_organization_preview(self):  # Renamed function
         """Starts the preview generation."""
         path = self.path_input.text()
@@ -1624,7 +4213,7 @@ class FileOrganizerWindow(QMainWindow):
             self.show_error_message("Please select a folder first.")
             return
         self.set_buttons_enabled(False)
-        self.log_area.clear()
+        self.clear_log()
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
         backup = self.backup_check.isChecked()
@@ -1639,7 +4228,7 @@ class FileOrganizerWindow(QMainWindow):
         reply = QMessageBox.question(self, "Confirm", "Are you sure you want to revert?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             self.set_buttons_enabled(False)
-            self.log_area.clear()
+            self.clear_log()
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)
             self.start_deorganization_signal.emit(path)
@@ -1653,10 +4242,10 @@ class FileOrganizerWindow(QMainWindow):
             self.show_error_message("Stop watching folder before scanning duplicates.")
             return
         self.set_buttons_enabled(False)
-        self.log_area.clear()
+        self.clear_log()
         self.progress_bar.setVisible(True)
         self.progress_bar.setRange(0, 0)
-        self.start_duplicate_scan_signal.emit(path)
+        self.start_duplicate_scan_signal.emit(path, self.duplicate_mode_combo.currentText())
 
     def start_empty_folder_cleanup(self):
         """Triggers the empty folder cleanup worker."""
@@ -1670,15 +4259,15 @@ class FileOrganizerWindow(QMainWindow):
         reply = QMessageBox.question(self, "Confirm", "Are you sure you want to delete all empty subfolders?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
             self.set_buttons_enabled(False)
-            self.log_area.clear()
+            self.clear_log()
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)
             self.start_cleanup_signal.emit(path)
 
     def export_log(self):
-        """Saves the current log content to a text file."""
-        log_content = self.log_area.toPlainText()
-        if not log_content:
+        """Saves the full log of the current session (not only the visible lines) to a text file."""
+        self.flush_log()
+        if not self.log_sink.session_lines:
             self.show_error_message("Log is empty.")
             return
 
@@ -1688,40 +4277,92 @@ class FileOrganizerWindow(QMainWindow):
         if file_path:
             try:
                 with open(file_path, "w", encoding="utf-8") as f:
-                    f.write(log_content)
-                self.log_area.append(f"--- Log exported to {file_path} ---")
+                    if self.log_sink.spill_path:
+                        for line in self.log_sink.iter_session():
+                            f.write(line + "\n")
+                    else:
+                        f.write(self.log_area.toPlainText())  # Activity log unavailable: visible lines only
+                self.append_log(f"--- Log exported to {file_path} ---")
             except IOError as exc:
                 self.show_error_message(f"Error exporting log: {exc}")
 
-    @Slot(str)
-    def update_log(self, message):
-        self.log_area.append(message)
+    @Slot()
+    def flush_log(self):
+        """Shows the lines queued since the last tick with a single append."""
+        batch = self.log_sink.drain()
+        if batch:
+            self.log_area.appendPlainText("\n".join(batch))
+
+    def append_log(self, message):
+        self.log_sink.write(message)
+
+    def clear_log(self):
+        self.flush_log()
+        self.log_area.clear()
+        self.log_sink.new_session()
+
+    @Slot(bool)
+    def toggle_pause(self, paused):
+        if paused:
+            self.worker.pause()
+            self.pause_btn.setIcon(qta.icon("fa5s.play"))
+            self.pause_btn.setText(" Resume")
+            self.append_log("--- Paused ---")
+        else:
+            self.worker.resume()
+            self.pause_btn.setIcon(qta.icon("fa5s.pause"))
+            self.pause_btn.setText(" Pause")
+            if self.cancel_btn.isEnabled():
+                self.append_log("--- Resumed ---")
+
+    def cancel_task(self):
+        self.worker.cancel()  # Also releases a paused task, which then stops at its next checkpoint
+        self.cancel_btn.setEnabled(False)
+        self.pause_btn.setEnabled(False)
+        self.append_log("--- Cancelling... ---")
 
     @Slot(int, int)
     def update_progress(self, current, total):
-        if self.progress_bar.maximum() == 0:
+        # Always reset the range: each phase of a task reports its own total
+        if self.progress_bar.maximum() != total:
             self.progress_bar.setRange(0, total)
         self.progress_bar.setValue(current)
 
+    @Slot(str, float, float, float)
+    def update_progress_stats(self, phase, items_per_sec, bytes_per_sec, eta):
+        text = f"{phase}: {items_per_sec:,.0f} files/s"
+        if bytes_per_sec > 0:
+            text += f" | {bytes_per_sec / (1024 * 1024):,.1f} MB/s"
+        if eta >= 0:
+            minutes, seconds = divmod(int(eta + 0.5), 60)
+            text += f" | ETA {minutes // 60}:{minutes % 60:02d}:{seconds:02d}"
+        self.progress_label.setText(text)
+        self.progress_label.setVisible(self.progress_bar.isVisible())
+
     @Slot()
     def on_task_finished(self):
         if not (self.watcher_check.isEnabled() and self.watcher_check.isChecked()):
             self.set_buttons_enabled(True)
         self.progress_bar.setVisible(False)
         self.progress_bar.setValue(0)
+        self.progress_label.setVisible(False)
+        if self.resume_check_folder:
+            folder, self.resume_check_folder = self.resume_check_folder, None
+            self.offer_resume(folder)
 
-    @Slot(list, dict, bool)
+    @Slot(object, dict, bool)
     def on_organization_preview_ready(self, proposed_moves, move_log_data, backup_flag):
         """Shows the preview dialog."""
         self.set_buttons_enabled(True)
         self.progress_bar.setVisible(False)
         self.progress_bar.setValue(0)
+        self.progress_label.setVisible(False)
         if not proposed_moves:
             QMessageBox.information(self, "Preview", "No files need organizing.")
             return
         dialog = PreviewDialog(proposed_moves, self)  # Pass self (main window) as parent
         if dialog.exec():
-            self.log_area.append("--- User approved. Starting organization... ---")
+            self.append_log("--- User approved. Starting organization... ---")
             self.set_buttons_enabled(False)
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)
@@ -1730,31 +4371,36 @@ class FileOrganizerWindow(QMainWindow):
             QApplication.beep()
             self.show_tray_notification("Organization started...")
         else:
-            self.log_area.append("--- Organization cancelled. ---")
+            self.append_log("--- Organization cancelled. ---")
             self.on_task_finished()
 
     @Slot(int, str, dict)  # MODIFIED: int, str, dict
     def on_folder_stats_ready(self, count, size_str, type_counts):  # MODIFIED: size_str
         """Updates the stats label."""
         self.stats_label.setText(f"Files: {count} | Total Size: {size_str}")
-        self.on_task_finished()
 
-    @Slot(dict)
-    def on_duplicate_scan_finished(self, duplicates):
-        deleted_count = 0
-        if not duplicates:
+    @Slot(object, list)
+    def on_duplicate_scan_finished(self, duplicates, linked):
+        if not duplicates and not linked:
             QMessageBox.information(self, "No Duplicates", "No duplicate files found.")
         else:
-            dialog = DuplicateFilesDialog(duplicates, self)
-            if dialog.exec():
-                deleted_count = dialog.deleted_count
-                self.log_area.append(f"--- Duplicate deletion complete ({deleted_count} files removed). ---")
-            else:
-                self.log_area.append("--- Duplicate deletion cancelled. ---")
+            dialog = DuplicateFilesDialog(duplicates, linked, self)
+            if dialog.exec() and dialog.pairs:
+                # The worker deletes/links the files and reports progress; buttons stay disabled until then
+                self.set_buttons_enabled(False)  # Re-arms Pause/Cancel, e.g. after a cancelled scan
+                self.progress_bar.setRange(0, len(dialog.pairs))
+                self.process_duplicates_signal.emit(dialog.pairs, dialog.mode)
+                return
+            self.append_log("--- Duplicate cleanup cancelled. ---")
         QApplication.beep()
-        self.show_tray_notification(f"Duplicate scan finished. {deleted_count} files deleted.")
+        self.show_tray_notification("Duplicate scan finished.")
         self.on_task_finished()
 
+    @Slot(str)
+    def on_duplicates_processed(self, summary):
+        QApplication.beep()
+        self.show_tray_notification(summary)
+
     def set_buttons_enabled(self, enabled):
         buttons = [
             self.browse_btn,
@@ -1763,6 +4409,7 @@ class FileOrganizerWindow(QMainWindow):
             self.categories_btn,
             self.theme_toggle_btn,
             self.duplicates_btn,
+            self.duplicate_mode_combo,
             self.cleanup_btn,
             self.conflict_combo,
             self.watcher_check,
@@ -1775,6 +4422,11 @@ class FileOrganizerWindow(QMainWindow):
         ]
         for w in buttons:
             w.setEnabled(enabled)
+        # Job controls work the other way round: only while a task runs
+        if enabled:
+            self.pause_btn.setChecked(False)
+        self.pause_btn.setEnabled(not enabled)
+        self.cancel_btn.setEnabled(not enabled)
 
         watcher_enabled = enabled and WATCHDOG_AVAILABLE and bool(self.path_input.text())
         self.watcher_check.setEnabled(watcher_enabled)
@@ -1786,10 +4438,12 @@ class FileOrganizerWindow(QMainWindow):
             self.worker.load_settings()
         dialog = CategoryEditor(self.worker.categories, self)
         if dialog.exec():
-            # Save categories directly to worker and then to settings
-            self.worker.categories = dialog.get_categories()
+            # Save categories directly to worker (rebuilding its extension index) and then to settings
+            self.worker.apply_settings(dialog.get_categories(), self.worker.rules)
             self.save_app_settings()
-            self.log_area.append("Categories updated.")
+            self.append_log("Categories updated.")
+            for overlap in self.worker.describe_category_overlaps():
+                self.append_log(f"  - Shared extension: {overlap}")
 
     def conflict_strategy_changed(self, text):
         self.worker.conflict_strategy = text.lower()
@@ -1827,7 +4481,7 @@ class FileOrganizerWindow(QMainWindow):
             self.watcher.file_created.connect(self.organize_one_file_signal.emit)
             self.watcher_thread.started.connect(self.watcher.start)
             self.watcher_thread.start()
-            self.log_area.append(f"--- Started watching: {path} ---")
+            self.append_log(f"--- Started watching: {path} ---")
             self.watcher_check.setEnabled(True)
             self.progress_bar.setVisible(True)
             self.progress_bar.setRange(0, 0)
@@ -1838,7 +4492,7 @@ class FileOrganizerWindow(QMainWindow):
             self.watcher_thread.wait()
             self.watcher = None
             self.watcher_thread = None
-            self.log_area.append(f"--- Stopped watching folder ---")
+            self.append_log(f"--- Stopped watching folder ---")
             self.set_buttons_enabled(True)
             self.progress_bar.setVisible(False)
             self.show_tray_notification("Stopped watching folder.")
@@ -1861,6 +4515,7 @@ class FileOrganizerWindow(QMainWindow):
             self.watcher_thread.quit()
             self.watcher_thread.wait()
         self.save_app_settings()  # Save settings on quit
+        self.log_sink.close()
         QApplication.instance().quit()
 
     def closeEvent(self, event):
@@ -1899,9 +4554,10 @@ class FileOrganizerWindow(QMainWindow):
                 <ul><li>It moves files back to their original locations recorded in the log.</li>
                     <li><b>Important:</b> It cannot undo 'delete' or 'copy' actions and might rename files if the original location already has a file with the same name.</li></ul>
             </li>
-            <li><b>Duplicates Button (Copy Icon):</b> Scans the selected folder (and subfolders) for files with identical content (using MD5 hash).
-                <ul><li>Opens a dialog listing duplicate sets.</li>
-                    <li>Allows you to select and permanently delete redundant copies (keeps one original automatically).</li></ul>
+            <li><b>Duplicates Button (Copy Icon):</b> Scans the selected folder (and subfolders) for files with identical content (using MD5 hash by default).
+                <ul><li>Opens a dialog listing duplicate sets. Paths that are already hard links to one file are listed separately below them; they take no extra space and can't be selected.</li>
+                    <li>Switch the mode next to the button to <b>Similar Images</b> to also catch resized or re-encoded copies of the same photo, or to <b>Similar Documents</b> for TXT/PDF/DOCX files with mostly the same text (re-exports, drafts).</li>
+                    <li>Allows you to select and permanently delete redundant copies, or replace them with links (keeps one original automatically; choose it per set with <i>Keep oldest/newest/shortest path</i>).</li></ul>
             </li>
             <li><b>Clean Empty Button (Broom Icon):</b> Scans the selected folder (and subfolders) and permanently deletes any directories that contain no files or other directories.</li>
         </ul>
@@ -1926,8 +4582,8 @@ class FileOrganizerWindow(QMainWindow):
         <b style='font-size: 11pt;'>Main Area:</b><br>
         <ul>
             <li><b>Stats Label:</b> Shows the total file count and size for the selected folder (after clicking Browse or dropping a folder).</li>
-            <li><b>Export Log Button:</b> Saves the text currently visible in the Log Area to a `.txt` file.</li>
-            <li><b>Log Area:</b> Displays messages about ongoing processes, results, warnings, and errors.</li>
+            <li><b>Export Log Button:</b> Saves the full log of the current session to a `.txt` file, including lines that have scrolled out of the Log Area.</li>
+            <li><b>Log Area:</b> Displays messages about ongoing processes, results, warnings, and errors. Only the most recent lines are kept on screen; the full log is kept in `.organizer_activity.jsonl`.</li>
             <li><b>Progress Bar:</b> Shows the progress of tasks like organizing, scanning, or cleaning.</li>
         </ul>
 
@@ -2062,72 +4718,297 @@ class CategoryEditor(QDialog):
         return self.categories
 
 
-class DuplicateFilesDialog(QDialog):
+class DuplicateTableModel(QAbstractTableModel):
+    """Table model over duplicate sets: one row per path, grouped by hash, with check states.
+
+    Checked rows are the copies to remove; each set's unchecked "keep" row can't be checked,
+    so one copy always survives. Selection strategies pick the kept row of every set at once.
+    """
+
+    HEADERS = ("", "Set", "File Name", "Path")
+    STRATEGIES = ("Keep first found", "Keep oldest", "Keep newest", "Keep shortest path")
+
     def __init__(self, duplicates, parent=None):
+        super().__init__(parent)
+        self.paths = []
+        self.mtimes = array("q")  # Row -> mtime_ns from the scan, for the oldest/newest strategies
+        self.group_of = array("l")  # Row -> set number
+        self.group_start = array("l")  # Set number -> first row (plus a final end marker)
+        for group, entries in enumerate(duplicates.values()):
+            self.group_start.append(len(self.paths))
+            self.paths.extend(entry.path for entry in entries)
+            self.mtimes.extend(entry.mtime_ns for entry in entries)
+            self.group_of.extend([group] * len(entries))
+        self.group_start.append(len(self.paths))
+        self.keep = array("l", self.group_start[:-1])  # Set number -> kept row
+        self.checked = bytearray(b"\x01" * len(self.paths))
+        for row in self.keep:
+            self.checked[row] = 0
+        self.bold_font = QFont()
+        self.bold_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.paths)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def is_keep(self, row):
+        return self.keep[self.group_of[row]] == row
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.CheckStateRole and column == 0:
+            return Qt.CheckState.Checked if self.checked[row] else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 1:
+                return self.group_of[row] + 1
+            if column == 2:
+                return os.path.basename(self.paths[row])
+            if column == 3:
+                return self.paths[row]
+        elif role == Qt.ItemDataRole.FontRole and self.is_keep(row):
+            return self.bold_font
+        elif role == Qt.ItemDataRole.ToolTipRole and self.is_keep(row):
+            return "Kept copy"
+        return None
+
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.column() == 0 and not self.is_keep(index.row()):
+            flags |= Qt.ItemFlag.ItemIsUserCheckable
+        return flags
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if role != Qt.ItemDataRole.CheckStateRole or index.column() != 0 or self.is_keep(index.row()):
+            return False
+        self.checked[index.row()] = Qt.CheckState(value) == Qt.CheckState.Checked
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        return True
+
+    def apply_strategy(self, strategy):
+        """Keeps one file per set by `strategy` (one of STRATEGIES) and checks all the others."""
+        if strategy == "Keep shortest path":
+            key = lambda row: (len(self.paths[row]), row)
+        elif strategy in ("Keep oldest", "Keep newest"):
+            # Modification times as the scan saw them: no disk access on the UI thread
+            sign = 1 if strategy == "Keep oldest" else -1
+            key = lambda row: (sign * self.mtimes[row], row)
+        else:
+            key = lambda row: row
+        self.beginResetModel()
+        for group in range(len(self.keep)):
+            rows = range(self.group_start[group], self.group_start[group + 1])
+            keep = min(rows, key=key)
+            self.keep[group] = keep
+            for row in rows:
+                self.checked[row] = row != keep
+        self.endResetModel()
+
+    def checked_pairs(self):
+        """[kept path, duplicate path] for every checked row."""
+        return [
+            [self.paths[self.keep[self.group_of[row]]], self.paths[row]]
+            for row in range(len(self.paths))
+            if self.checked[row]
+        ]
+
+
+class DuplicateFilesDialog(QDialog):
+    def __init__(self, duplicates, linked=(), parent=None):
         super().__init__(parent)
         self.duplicates = duplicates
         self.setWindowTitle("Duplicate File Finder")
         self.setMinimumSize(800, 600)
-        self.deleted_count = 0
+        self.pairs = []  # [kept path, duplicate path] to process once accepted
+        self.mode = "delete"  # 'delete', 'hardlink' or 'reflink'
         layout = QVBoxLayout(self)
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["", "File Name", "Path"])
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
+
+        strategy_layout = QHBoxLayout()
+        strategy_layout.addWidget(QLabel(f"<b>{len(duplicates)} duplicate sets.</b> Selection:"))
+        self.strategy_combo = QComboBox()
+        self.strategy_combo.addItems(DuplicateTableModel.STRATEGIES)
+        self.strategy_combo.setToolTip("Which copy of each set to keep; all other copies are selected")
+        strategy_layout.addWidget(self.strategy_combo)
+        strategy_layout.addStretch()
+        layout.addLayout(strategy_layout)
+
+        self.model = DuplicateTableModel(duplicates, self)
+        self.strategy_combo.currentTextChanged.connect(self.model.apply_strategy)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.Stretch)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.table.fontMetrics().height() + 8)
         self.table.setColumnWidth(0, 40)
-        self.populate_table()
+        self.table.setColumnWidth(1, 50)
+        self.table.setColumnWidth(2, 220)
         layout.addWidget(self.table)
+
+        if linked:
+            # Paths sharing one file: shown for reference only, never offered for removal
+            layout.addWidget(QLabel(f"<b>{len(linked)} sets already hard-linked</b> (one file under several paths, nothing to reclaim):"))
+            self.linked_view = QPlainTextEdit()
+            self.linked_view.setReadOnly(True)
+            self.linked_view.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
+            self.linked_view.setPlainText("\n".join(" = ".join(paths) for paths in linked))
+            self.linked_view.setMaximumHeight(120)
+            layout.addWidget(self.linked_view)
+
         btn_layout = QHBoxLayout()
-        self.status_label = QLabel("Select files to delete.")
+        self.status_label = QLabel("Select files to delete or replace with links.")
+        self.link_mode_combo = QComboBox()
+        self.link_mode_combo.addItem("Hardlink", "hardlink")
+        if fcntl is not None:
+            self.link_mode_combo.addItem("Reflink (copy-on-write)", "reflink")
+        self.link_mode_combo.setToolTip("Hardlink: all paths share one file. Reflink: separate files sharing storage (Btrfs, XFS)")
+        link_btn = QPushButton(qta.icon("fa5s.link", color="white"), " Replace with Link")
+        link_btn.setToolTip("Replace selected copies with links to the kept file; every path stays valid")
+        link_btn.clicked.connect(self.link_selected)
         delete_btn = QPushButton(qta.icon("fa5s.trash-alt", color="white"), " Delete Selected")
         delete_btn.setObjectName("DeleteButton")
         delete_btn.clicked.connect(self.delete_selected)
         btn_layout.addWidget(self.status_label)
         btn_layout.addStretch()
+        btn_layout.addWidget(self.link_mode_combo)
+        btn_layout.addWidget(link_btn)
         btn_layout.addWidget(delete_btn)
         layout.addLayout(btn_layout)
 
-    def populate_table(self):
-        self.table.setRowCount(sum(len(files) for files in self.duplicates.values()))
-        row = 0
-        for hash_val, files in self.duplicates.items():
-            for i, filepath in enumerate(files):
-                checkbox = QCheckBox()
-                if i == 0:
-                    checkbox.setDisabled(True)
-                else:
-                    checkbox.setChecked(True)
-                self.table.setCellWidget(row, 0, checkbox)
-                self.table.setItem(row, 1, QTableWidgetItem(os.path.basename(filepath)))
-                self.table.setItem(row, 2, QTableWidgetItem(filepath))
-                row += 1
-
     def delete_selected(self):
-        files_to_delete = [
-            self.table.item(row, 2).text()
-            for row in range(self.table.rowCount())
-            if self.table.cellWidget(row, 0) and self.table.cellWidget(row, 0).isChecked()
-        ]
-        if not files_to_delete:
+        pairs = self.model.checked_pairs()
+        if not pairs:
             QMessageBox.warning(self, "No files selected", "Please select files to delete.")
             return
-        reply = QMessageBox.question(self, "Confirm Deletion", f"Are you sure you want to permanently delete {len(files_to_delete)} files?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        reply = QMessageBox.question(self, "Confirm Deletion", f"Are you sure you want to permanently delete {len(pairs)} files?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            error_count = 0
-            self.deleted_count = 0
-            for filepath in files_to_delete:
-                try:
-                    os.remove(filepath)
-                    self.deleted_count += 1
-                except OSError:
-                    self.status_label.setText(f"Error deleting {os.path.basename(filepath)}.")
-                    error_count += 1
-            if error_count > 0:
-                QMessageBox.warning(self, "Deletion Errors", f"Deleted {self.deleted_count} files, failed to delete {error_count} (check permissions).")
-            else:
-                QMessageBox.information(self, "Success", f"Successfully deleted {self.deleted_count} files.")
+            self.pairs, self.mode = pairs, "delete"
             self.accept()
 
+    def link_selected(self):
+        """Replaces each checked file with a hard link/reflink to its set's kept file."""
+        pairs = self.model.checked_pairs()
+        if not pairs:
+            QMessageBox.warning(self, "No files selected", "Please select files to replace with links.")
+            return
+        mode = self.link_mode_combo.currentData()
+        reply = QMessageBox.question(self, "Confirm Linking", f"Replace {len(pairs)} files with {mode}s to the kept copies? Each file is compared byte for byte first.", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.pairs, self.mode = pairs, mode
+            self.accept()
+
+
+class PreviewTableModel(QAbstractTableModel):
+    """Table model over a preview's PreviewRows columns.
+
+    Cells are formatted only when the view asks for them, so the model opens in constant time
+    for any plan size. Sorting and filtering rearrange a compact array of row numbers instead
+    of the rows themselves: a QSortFilterProxyModel would call back into Python for every
+    comparison, which takes minutes on a few hundred thousand rows.
+    """
+
+    HEADERS = ("Original File", "Action", "Details / New Location")
+
+    def __init__(self, proposed_actions, base_path="", theme="dark", parent=None):
+        super().__init__(parent)
+        self.rows = proposed_actions
+        self.base_path = base_path
+        self.order = None  # array('l') of visible row numbers; None = all rows in plan order
+        self.filter_text = ""
+        self.sort_column = None
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self.delete_font = QFont()
+        self.delete_font.setStrikeOut(True)
+        self.delete_color = QColor("#f85149" if theme == "dark" else "#cf222e")
+        self.copy_color = QColor("#3fb950" if theme == "dark" else "#1f883d")
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.rows) if self.order is None else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def row_at(self, view_row):
+        return self.rows.row(view_row if self.order is None else self.order[view_row])
+
+    def display_name(self, original_full_path):
+        """Path relative to the organized folder if possible, otherwise just the basename."""
+        if self.base_path:
+            try:
+                return os.path.relpath(original_full_path, self.base_path)
+            except ValueError:
+                pass  # Keep basename if relpath fails (e.g., different drive)
+        return os.path.basename(original_full_path)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        action_type, original_full_path, details = self.row_at(index.row())
+        column = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return self.display_name(original_full_path)
+            return action_type.capitalize() if column == 1 else details
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if action_type == "delete":
+                return self.delete_color
+            if action_type == "copy" and column == 1:
+                return self.copy_color
+        elif role == Qt.ItemDataRole.FontRole and action_type == "delete" and column == 0:
+            return self.delete_font
+        elif role == Qt.ItemDataRole.ToolTipRole and column == 0:
+            return original_full_path
+        return None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column, self.sort_order = (column if column >= 0 else None), order
+        self._rebuild()
+
+    def set_filter(self, text):
+        self.filter_text = text.strip().lower()
+        self._rebuild()
+
+    def _rebuild(self):
+        """Recomputes the visible row order from the current filter and sort."""
+        self.layoutAboutToBeChanged.emit()
+        rows = self.rows
+        indices = range(len(rows))
+        if self.filter_text:
+            needle = self.filter_text
+            actions, originals, destinations, statuses = rows.actions, rows.originals, rows.destinations, rows.statuses
+            indices = [
+                i
+                for i in indices
+                if needle in originals[i].lower()
+                or needle in destinations[i].lower()
+                or needle in statuses[i].lower()
+                or needle in actions[i]
+            ]
+        if self.sort_column is not None:
+            # Column 0 sorts by the full original path, which orders like the relative paths shown
+            if self.sort_column == 2:
+                key = lambda i: rows.details(i).lower()
+            else:
+                column = rows.originals if self.sort_column == 0 else rows.actions
+                key = lambda i: column[i].lower()
+            indices = sorted(indices, key=key, reverse=self.sort_order == Qt.SortOrder.DescendingOrder)
+        self.order = None if isinstance(indices, range) else array("l", indices)
+        self.layoutChanged.emit()
+
 
 class PreviewDialog(QDialog):
     """Dialog to show proposed file moves and get confirmation."""
@@ -2144,46 +5025,24 @@ class PreviewDialog(QDialog):
 
         layout = QVBoxLayout(self)
         layout.addWidget(QLabel(f"<b>Proposed Changes ({len(proposed_actions)} files):</b>"))
-
-        self.table = QTableWidget()
-        self.table.setColumnCount(3)  # Action Type column
-        self.table.setHorizontalHeaderLabels(["Original File", "Action", "Details / New Location"])
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filter by path, action or destination...")
+        layout.addWidget(self.filter_input)
+
+        theme = parent.current_theme if parent and hasattr(parent, "current_theme") else "dark"
+        self.model = PreviewTableModel(proposed_actions, base_path, theme, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Stretch)
         self.table.setColumnWidth(0, 250)
         self.table.setColumnWidth(1, 80)
-        self.table.setRowCount(len(proposed_actions))
+        # Fixed row heights let the view skip measuring rows it doesn't show
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(self.table.fontMetrics().height() + 8)
         self.table.setAlternatingRowColors(True)
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)  # Start in plan order
         self.table.setSortingEnabled(True)  # Make sortable
-
-        delete_font = QFont()
-        delete_font.setStrikeOut(True)
-        delete_color = QColor("#f85149" if parent.current_theme == "dark" else "#cf222e")
-        copy_color = QColor("#3fb950" if parent.current_theme == "dark" else "#1f883d")
-
-        for i, (action_type, original_full_path, details) in enumerate(proposed_actions):
-            # Show relative path if possible, otherwise just basename
-            display_name = os.path.basename(original_full_path)
-            if base_path:
-                try:
-                    display_name = os.path.relpath(original_full_path, base_path)
-                except ValueError:
-                    pass  # Keep basename if relpath fails (e.g., different drive)
-
-            item_original = QTableWidgetItem(display_name)
-            item_action = QTableWidgetItem(action_type.capitalize())
-            item_details = QTableWidgetItem(details)
-
-            if action_type == "delete":
-                item_original.setFont(delete_font)
-                item_original.setForeground(delete_color)
-                item_action.setForeground(delete_color)
-                item_details.setForeground(delete_color)
-            elif action_type == "copy":
-                item_action.setForeground(copy_color)
-
-            self.table.setItem(i, 0, item_original)
-            self.table.setItem(i, 1, item_action)
-            self.table.setItem(i, 2, item_details)
+        self.filter_input.textChanged.connect(self.model.set_filter)
 
         layout.addWidget(self.table)
 
@@ -2200,6 +5059,7 @@ class PreviewDialog(QDialog):
 
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # Needed for the metadata process pool in frozen (PyInstaller) builds
     app = QApplication(sys.argv)
     if not QSystemTrayIcon.isSystemTrayAvailable():
         QMessageBox.critical(None, "Error", "No system tray detected on this system.")
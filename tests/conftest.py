@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    """A Worker with default settings (none are read from the repository) and no hash cache."""
+    monkeypatch.chdir(tmp_path)
+    from main import Worker
+
+    worker = Worker()
+    worker.performance["hash_cache_max_entries"] = 0
+    return worker
+
+
+@pytest.fixture(scope="session")
+def qapp():
+    from PySide6.QtWidgets import QApplication
+
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,54 @@
+import os
+
+from main import DestinationNamespace
+
+
+def test_lists_a_folder_once_and_sees_reserved_names(tmp_path):
+    (tmp_path / "a.txt").write_text("x")
+    namespace = DestinationNamespace()
+    assert namespace.exists(str(tmp_path / "a.txt"))
+    assert not namespace.exists(str(tmp_path / "b.txt"))
+
+    (tmp_path / "late.txt").write_text("x")  # Created after the listing: not seen
+    assert not namespace.exists(str(tmp_path / "late.txt"))
+
+    namespace.reserve(str(tmp_path / "b.txt"))
+    assert namespace.exists(str(tmp_path / "b.txt"))
+    assert not (tmp_path / "b.txt").exists()
+
+
+def test_reserve_unique_keeps_a_free_name(tmp_path):
+    namespace = DestinationNamespace()
+    path = str(tmp_path / "photo.jpg")
+    assert namespace.reserve_unique(path) == path
+    assert namespace.exists(path)
+
+
+def test_reserve_unique_numbers_conflicts_and_skips_names_on_disk(tmp_path):
+    for name in ("photo.jpg", "photo (2).jpg"):
+        (tmp_path / name).write_text("x")
+    namespace = DestinationNamespace()
+    path = str(tmp_path / "photo.jpg")
+    assert [os.path.basename(namespace.reserve_unique(path)) for _ in range(3)] == [
+        "photo (1).jpg",
+        "photo (3).jpg",
+        "photo (4).jpg",
+    ]
+
+
+def test_counters_are_per_folder_and_name(tmp_path):
+    namespace = DestinationNamespace()
+    for folder in ("A", "B"):
+        for name in ("x.txt", "y.txt"):
+            namespace.reserve(str(tmp_path / folder / name))
+    assert namespace.reserve_unique(str(tmp_path / "A" / "x.txt")) == str(tmp_path / "A" / "x (1).txt")
+    assert namespace.reserve_unique(str(tmp_path / "A" / "y.txt")) == str(tmp_path / "A" / "y (1).txt")
+    assert namespace.reserve_unique(str(tmp_path / "B" / "x.txt")) == str(tmp_path / "B" / "x (1).txt")
+
+
+def test_missing_folder_has_no_conflicts(tmp_path):
+    namespace = DestinationNamespace()
+    path = str(tmp_path / "not" / "created" / "a.txt")
+    assert not namespace.exists(path)
+    assert namespace.reserve_unique(path) == path
+    assert namespace.reserve_unique(path) == str(tmp_path / "not" / "created" / "a (1).txt")
@@ -0,0 +1,39 @@
+from main import DuplicateTableModel, FileEntry
+
+
+def entry(path, mtime_ns):
+    return FileEntry(path, path.rsplit("/", 1)[-1], 10, mtime_ns, 0, 0)
+
+
+def duplicates():
+    # The paths don't exist: strategies must work from the scan's data alone
+    return {
+        "h1": [entry("/gone/a/x.txt", 300), entry("/gone/b/x.txt", 100), entry("/gone/x.txt", 200)],
+        "h2": [entry("/gone/long/path/y.txt", 50), entry("/gone/y.txt", 900)],
+    }
+
+
+def kept(model):
+    return [model.paths[row] for row in model.keep]
+
+
+def test_first_found_is_kept_by_default(qapp):
+    model = DuplicateTableModel(duplicates())
+    assert kept(model) == ["/gone/a/x.txt", "/gone/long/path/y.txt"]
+    assert model.checked_pairs() == [
+        ["/gone/a/x.txt", "/gone/b/x.txt"],
+        ["/gone/a/x.txt", "/gone/x.txt"],
+        ["/gone/long/path/y.txt", "/gone/y.txt"],
+    ]
+
+
+def test_strategies_pick_the_kept_copy_of_every_set(qapp):
+    model = DuplicateTableModel(duplicates())
+    model.apply_strategy("Keep oldest")
+    assert kept(model) == ["/gone/b/x.txt", "/gone/long/path/y.txt"]
+    model.apply_strategy("Keep newest")
+    assert kept(model) == ["/gone/a/x.txt", "/gone/y.txt"]
+    model.apply_strategy("Keep shortest path")
+    assert kept(model) == ["/gone/x.txt", "/gone/y.txt"]
+    assert sum(model.checked) == 3
+    assert not any(model.checked[row] for row in model.keep)
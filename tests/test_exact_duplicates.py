@@ -0,0 +1,35 @@
+import os
+
+from main import DuplicateFilesDialog, TreeSnapshot
+
+
+def test_hard_links_are_reported_apart_from_duplicates(worker, tmp_path):
+    (tmp_path / "a.txt").write_text("same")
+    os.link(tmp_path / "a.txt", tmp_path / "a_link.txt")
+    (tmp_path / "b.txt").write_text("same")
+    (tmp_path / "c.txt").write_text("other")
+    results = []
+    worker.duplicate_scan_finished.connect(lambda duplicates, linked: results.append((duplicates, linked)))
+
+    worker.run_duplicate_scan(str(tmp_path))
+
+    ((duplicates, linked),) = results
+    # The hard-linked pair appears in the set once, under whichever path was walked first
+    (group,) = duplicates.values()
+    names = sorted(entry.name for entry in group)
+    assert names in (["a.txt", "b.txt"], ["a_link.txt", "b.txt"])
+    assert [sorted(paths) for paths in linked] == [[str(tmp_path / "a.txt"), str(tmp_path / "a_link.txt")]]
+
+
+def test_linked_sets_are_listed_but_never_selectable(worker, qapp, tmp_path):
+    (tmp_path / "a.txt").write_text("same")
+    (tmp_path / "b.txt").write_text("same")
+    entries = TreeSnapshot.scan(str(tmp_path)).visible_files()
+    linked = [["/x/one.txt", "/y/one.txt"]]
+
+    dialog = DuplicateFilesDialog({"h": entries}, linked)
+
+    assert dialog.linked_view.isReadOnly()
+    assert dialog.linked_view.toPlainText() == "/x/one.txt = /y/one.txt"
+    assert "/y/one.txt" not in dialog.model.paths
+    assert all(pair[1] != "/y/one.txt" for pair in dialog.model.checked_pairs())
@@ -0,0 +1,72 @@
+import os
+
+import pytest
+
+import main
+from main import OperationJournal
+
+
+def plan(root, names, action="move"):
+    (root / "dest").mkdir(exist_ok=True)
+    operations = []
+    for op_id, name in enumerate(names):
+        (root / name).write_text(name)
+        operations.append((op_id, str(root / "dest" / name), str(root / name), action))
+    return operations
+
+
+def run(worker, root, operations):
+    journal = OperationJournal(str(root))
+    journal.start(operations)
+    log = worker._execute_plan(str(root), operations, journal)
+    journal.close()
+    return log, OperationJournal.load(str(root))
+
+
+def test_undo_log_follows_the_plan(worker, tmp_path):
+    operations = plan(tmp_path, [f"f{i}.txt" for i in range(5)])
+    log, (_plan, begun, settled) = run(worker, tmp_path, operations)
+    assert list(log) == [dest for _op_id, dest, _src, _action in operations]
+    assert begun == set(settled) == set(range(5))
+
+
+def test_unexpected_error_fails_one_rename_and_the_run_goes_on(worker, tmp_path, monkeypatch):
+    operations = plan(tmp_path, ["a.txt", "bad.txt", "c.txt"])
+    real_rename = os.rename
+
+    def rename(src, dst):
+        if os.path.basename(src) == "bad.txt":
+            raise ValueError("unexpected")
+        real_rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", rename)
+    log, (_plan, _begun, settled) = run(worker, tmp_path, operations)
+    assert sorted(os.path.basename(dest) for dest in log) == ["a.txt", "c.txt"]
+    assert settled == {0: "done", 1: "failed", 2: "done"}
+    assert (tmp_path / "bad.txt").exists()
+
+
+def test_pooled_transfers_finish_in_plan_order_in_the_undo_log(worker, tmp_path):
+    operations = plan(tmp_path, [f"f{i}.txt" for i in range(30)], action="copy")
+    log, (_plan, begun, settled) = run(worker, tmp_path, operations)
+    assert list(log) == [dest for _op_id, dest, _src, _action in operations]
+    assert begun == set(settled) == set(range(30))
+
+
+def test_cancelled_pool_leaves_only_the_submitted_window_begun(worker, tmp_path, monkeypatch):
+    worker.performance["copy_workers_per_device"] = 1
+    operations = plan(tmp_path, [f"f{i}.txt" for i in range(200)], action="copy")
+    real_transfer = main.transfer_file
+    calls = []
+
+    def transfer(*args):
+        calls.append(args[0])
+        if len(calls) == 3:
+            worker.cancel()
+        return real_transfer(*args)
+
+    monkeypatch.setattr(main, "transfer_file", transfer)
+    log, (_plan, begun, settled) = run(worker, tmp_path, operations)
+    assert len(log) == len(calls) <= 4
+    assert len(begun) <= len(calls) + 2  # Plus the window of twice the single worker
+    assert set(settled) <= begun
@@ -0,0 +1,67 @@
+from PIL import Image, TiffImagePlugin
+
+import main
+
+
+def save_jpeg(path, exif=None, padding=0):
+    """A small JPEG with the given tags; `padding` bytes of COM segments go before the EXIF block."""
+    img = Image.new("RGB", (8, 8), "red")
+    kwargs = {"exif": exif} if exif is not None else {}
+    img.save(path, "JPEG", **kwargs)
+    if padding:
+        data = path.read_bytes()
+        comment = b"\xff\xfe" + (0xFFF0 + 2).to_bytes(2, "big") + b"x" * 0xFFF0
+        path.write_bytes(data[:2] + comment * (padding // 0xFFF0 + 1) + data[2:])
+
+
+def camera_exif():
+    exif = Image.Exif()
+    exif[0x0110] = "Model X "
+    exif[0x013B] = "Jane Doe"
+    exif[0x0132] = "2023:04:05 06:07:08"
+    sub_ifd = exif.get_ifd(main.EXIF_SUBIFD_POINTER)
+    sub_ifd[0x829D] = TiffImagePlugin.IFDRational(28, 10)
+    sub_ifd[0x9003] = "2023:04:05 06:07:08"
+    sub_ifd[0xA434] = "50mm F1.8"
+    return exif
+
+
+def test_header_parse_reads_ifd0_and_exif_sub_ifd(tmp_path):
+    path = tmp_path / "photo.jpg"
+    save_jpeg(path, camera_exif())
+    exif = main._read_exif_header(path)
+    assert exif == {
+        "Model": "Model X",
+        "Artist": "Jane Doe",
+        "DateTime": "2023:04:05 06:07:08",
+        "FNumber": 2.8,
+        "DateTimeOriginal": "2023:04:05 06:07:08",
+        "LensModel": "50mm F1.8",
+    }
+    assert main.read_exif_data(path) == exif
+
+
+def test_header_parse_agrees_with_pil(tmp_path):
+    path = tmp_path / "photo.jpg"
+    save_jpeg(path, camera_exif())
+    assert main._read_exif_header(path) == main._read_exif_pil(path)
+
+
+def test_jpeg_without_exif_has_no_tags(tmp_path):
+    path = tmp_path / "plain.jpg"
+    save_jpeg(path)
+    assert main._read_exif_header(path) == {}
+    assert main.read_exif_data(path) == {}
+
+
+def test_exif_beyond_the_header_buffer_falls_back_to_pil(tmp_path):
+    path = tmp_path / "late.jpg"
+    save_jpeg(path, camera_exif(), padding=main.EXIF_HEADER_BYTES)
+    assert main._read_exif_header(path) is None
+    assert main.read_exif_data(path)["Model"] == "Model X"
+
+
+def test_tiff_header_is_found_at_offset_zero():
+    assert main._find_tiff_header(b"II*\x00" + bytes(8)) == 0
+    assert main._find_tiff_header(b"MM\x00*" + bytes(8)) == 0
+    assert main._find_tiff_header(b"not an image") is None
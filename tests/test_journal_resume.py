@@ -0,0 +1,81 @@
+import os
+
+import pytest
+
+from main import partial_path
+
+
+@pytest.fixture
+def files(tmp_path):
+    src, dest = tmp_path / "src.txt", tmp_path / "out" / "src.txt"
+    dest.parent.mkdir()
+    src.write_text("payload")
+    return src, dest
+
+
+def state(worker, src, dest, action, was_begun):
+    return worker._journaled_state((1, str(dest), str(src), action), was_begun)
+
+
+@pytest.mark.parametrize("was_begun", [False, True])
+def test_delete_is_done_once_the_file_is_gone(worker, files, was_begun):
+    src, _dest = files
+    assert state(worker, src, None, "delete", was_begun) == "pending"
+    src.unlink()
+    assert state(worker, src, None, "delete", was_begun) == "done"
+
+
+def test_operation_not_yet_run_is_pending(worker, files):
+    src, dest = files
+    assert state(worker, src, dest, "move", False) == "pending"
+
+
+def test_begun_transfer_drops_its_partial_copy_and_is_pending(worker, files):
+    src, dest = files
+    partial = partial_path(str(dest))
+    with open(partial, "w") as f:
+        f.write("pay")
+    assert state(worker, src, dest, "copy", True) == "pending"
+    assert not dest.exists()
+    assert src.read_text() == "payload"
+    assert not os.path.exists(partial)
+
+
+def test_finished_move_is_done(worker, files):
+    src, dest = files
+    src.rename(dest)
+    assert state(worker, src, dest, "move", True) == "done"
+    assert dest.read_text() == "payload"
+
+
+def test_copy_whose_source_vanished_is_skipped(worker, files):
+    src, dest = files
+    src.unlink()
+    assert state(worker, src, dest, "copy", False) == "source no longer exists"
+
+
+def test_move_that_copied_but_kept_its_source_removes_the_source(worker, files):
+    src, dest = files
+    dest.write_text("payload")
+    assert state(worker, src, dest, "move", True) == "done"
+    assert not src.exists()
+    assert dest.read_text() == "payload"
+
+
+def test_finished_copy_keeps_its_source(worker, files):
+    src, dest = files
+    dest.write_text("payload")
+    assert state(worker, src, dest, "copy", True) == "done"
+    assert src.exists() and dest.exists()
+
+
+@pytest.mark.parametrize(
+    "dest_text, was_begun",
+    [("payload", False), ("someone else's file", False), ("someone else's file", True)],
+)
+def test_existing_destination_is_never_deleted(worker, files, dest_text, was_begun):
+    src, dest = files
+    dest.write_text(dest_text)
+    assert state(worker, src, dest, "move", was_begun) == "destination was taken since the plan was made"
+    assert src.read_text() == "payload"
+    assert dest.read_text() == dest_text
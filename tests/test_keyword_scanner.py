@@ -0,0 +1,37 @@
+from main import KeywordScanner
+
+
+def test_finds_every_keyword_in_one_pass():
+    scanner = KeywordScanner({"invoice", "tax", "receipt"})
+    assert scanner.scan(["Your INVOICE for the tax year"], set()) == {"invoice", "tax"}
+
+
+def test_overlapping_and_prefix_keywords_are_all_found():
+    scanner = KeywordScanner({"he", "she", "hers", "his"})
+    assert scanner.scan(["ushers"], set()) == {"he", "she", "hers"}
+
+
+def test_keywords_spanning_segments_are_not_joined():
+    scanner = KeywordScanner({"taxreturn"})
+    assert scanner.scan(["tax", "return"], set()) == set()
+
+
+def test_adds_to_the_found_set_and_stops_once_all_are_found():
+    scanner = KeywordScanner({"alpha", "beta"})
+    found = scanner.scan(["alpha"], set())
+    assert found == {"alpha"}
+
+    def segments():
+        yield "beta"
+        raise AssertionError("scanned past the point where every keyword was found")
+
+    assert scanner.scan(segments(), found) == {"alpha", "beta"}
+
+
+def test_keywords_with_regex_characters_match_literally():
+    scanner = KeywordScanner({"c++", "a.b"})
+    assert scanner.scan(["learn c++ now", "axb"], set()) == {"c++"}
+
+
+def test_no_keywords():
+    assert KeywordScanner(()).scan(["anything"], set()) == set()
@@ -0,0 +1,82 @@
+import random
+
+import pytest
+
+from main import FileEntry, MINHASH_BINS, document_minhash, lsh_band_rows, minhash_similarity
+
+BUDGET = {"max_pages": 10, "max_bytes": 1 << 20, "max_chars": 1 << 20}
+VOCABULARY = [f"word{i}" for i in range(2000)]
+
+
+def words(seed, count=600):
+    rng = random.Random(seed)
+    return [rng.choice(VOCABULARY) for _ in range(count)]
+
+
+def edited(text_words, every):
+    """A copy with one word in `every` replaced."""
+    return [f"edit{i}" if i % every == 0 else word for i, word in enumerate(text_words)]
+
+
+def signature(tmp_path, name, text_words):
+    path = tmp_path / name
+    path.write_text(" ".join(text_words))
+    sig = document_minhash(FileEntry.from_path(str(path)), BUDGET)
+    return [int(sig[i : i + 15], 16) for i in range(0, len(sig), 15)]
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.7, 0.8, 0.9])
+def test_band_split_covers_the_signature_and_rises_below_the_threshold(threshold):
+    bands, rows = lsh_band_rows(threshold)
+    assert bands * rows == MINHASH_BINS
+    assert (1 / bands) ** (1 / rows) <= threshold
+
+
+def test_minhash_similarity_tracks_shared_shingles(tmp_path):
+    base = words(1)
+    same = signature(tmp_path, "a.txt", base)
+    assert minhash_similarity(same, signature(tmp_path, "b.txt", base)) == 1.0
+    close = minhash_similarity(same, signature(tmp_path, "c.txt", edited(base, 40)))
+    assert 0.7 <= close < 1.0
+    assert minhash_similarity(same, signature(tmp_path, "d.txt", words(2))) < 0.1
+
+
+def test_document_without_text_has_empty_signature(tmp_path):
+    path = tmp_path / "empty.txt"
+    path.write_text("")
+    assert document_minhash(FileEntry.from_path(str(path)), BUDGET) == ""
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_lsh_groups_near_duplicates_only(worker, tmp_path, workers):
+    worker.performance["metadata_workers"] = workers
+    base = words(1)
+    texts = {
+        "original.txt": base,
+        "revised.txt": edited(base, 60),
+        "other.txt": words(2),
+        "same_opening.txt": base[:40] + words(3),
+    }
+    entries = []
+    for name, text_words in texts.items():
+        path = tmp_path / name
+        path.write_text(" ".join(text_words))
+        entries.append(FileEntry.from_path(str(path)))
+
+    groups = worker._find_similar_documents(entries)
+    assert [[entry.path for entry in group] for group in groups.values()] == [[str(tmp_path / "original.txt"), str(tmp_path / "revised.txt")]]
+
+
+def test_lsh_only_verifies_pairs_sharing_a_band(worker, tmp_path):
+    worker.performance["metadata_workers"] = 1
+    entries = []
+    for n in range(20):
+        path = tmp_path / f"doc{n}.txt"
+        path.write_text(" ".join(words(100 + n)))
+        entries.append(FileEntry.from_path(str(path)))
+    logged = []
+    worker.log = logged.append
+
+    assert worker._find_similar_documents(entries) == {}
+    (line,) = [message for message in logged if message.startswith("LSH:")]
+    assert "0 candidate pairs verified" in line
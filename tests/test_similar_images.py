@@ -0,0 +1,56 @@
+import random
+
+import pytest
+from PIL import Image
+
+from main import BKTree, image_dhash
+
+
+def hamming(a, b):
+    return bin(a ^ b).count("1")
+
+
+def test_search_matches_brute_force():
+    rng = random.Random(1)
+    values = [rng.getrandbits(64) for _ in range(300)]
+    # Near-copies so some searches find more than the query itself
+    values += [value ^ (1 << rng.randrange(64)) for value in values[:50]]
+    tree = BKTree()
+    for item, value in enumerate(values):
+        tree.add(value, item)
+    for radius in (0, 3, 10):
+        for query in values[:60]:
+            expected = sorted(i for i, value in enumerate(values) if hamming(query, value) <= radius)
+            assert sorted(tree.search(query, radius)) == expected
+
+
+def test_equal_hashes_share_a_node():
+    tree = BKTree()
+    tree.add(0b1010, "a")
+    tree.add(0b1010, "b")
+    tree.add(0b1011, "c")
+    assert sorted(tree.search(0b1010, 0)) == ["a", "b"]
+    assert sorted(tree.search(0b1010, 1)) == ["a", "b", "c"]
+
+
+def test_empty_tree():
+    assert BKTree().search(0, 64) == []
+
+
+def test_dhash_of_a_resized_copy_is_close(tmp_path):
+    img = Image.linear_gradient("L").rotate(30).convert("RGB")
+    img.save(tmp_path / "a.png")
+    img.resize((128, 128)).save(tmp_path / "b.jpg", quality=80)
+    a, b = int(image_dhash(tmp_path / "a.png"), 16), int(image_dhash(tmp_path / "b.jpg"), 16)
+    assert hamming(a, b) <= 6
+
+
+@pytest.mark.parametrize("data", [b"", b"not an image", None])
+def test_dhash_of_an_unreadable_image_raises_oserror(tmp_path, data):
+    path = tmp_path / "bad.jpg"
+    if data is None:  # Truncated JPEG
+        Image.new("RGB", (64, 64), "blue").save(path)
+        data = path.read_bytes()[:200]
+    path.write_bytes(data)
+    with pytest.raises(OSError):
+        image_dhash(path)
@@ -0,0 +1,84 @@
+import hashlib
+import os
+
+import pytest
+
+import main
+from main import partial_path, transfer_file
+
+
+@pytest.fixture
+def source(tmp_path):
+    src = tmp_path / "src.bin"
+    src.write_bytes(os.urandom(300_000))
+    (tmp_path / "out").mkdir()
+    return src, tmp_path / "out" / "src.bin"
+
+
+def test_full_verification_hashes_in_the_copy_pass_only(source, monkeypatch):
+    src, dest = source
+    data = src.read_bytes()
+    monkeypatch.setattr(main, "hash_path", lambda *args: pytest.fail("the copy was read back"))
+    size, digest = transfer_file(str(src), str(dest), "move", verify_algorithm="sha256", verify_mode="full")
+    assert (size, digest) == (len(data), hashlib.sha256(data).hexdigest())
+    assert dest.read_bytes() == data
+    assert not src.exists()
+
+
+def test_readback_reads_the_copy_once(source, monkeypatch):
+    src, dest = source
+    reads = []
+    real_hash_path = main.hash_path
+    monkeypatch.setattr(main, "hash_path", lambda path, new_hasher: reads.append(path) or real_hash_path(path, new_hasher))
+    transfer_file(str(src), str(dest), "move", verify_algorithm="sha256", verify_mode="readback")
+    assert reads == [partial_path(str(dest))]
+    assert not src.exists()
+
+
+def test_source_changed_during_the_copy_is_kept(source, monkeypatch):
+    src, dest = source
+    real_copy = main.copy_file_data
+
+    def copy_then_touch(*args):
+        digest = real_copy(*args)
+        os.utime(src, ns=(0, 0))
+        return digest
+
+    monkeypatch.setattr(main, "copy_file_data", copy_then_touch)
+    with pytest.raises(OSError, match="changed while it was copied"):
+        transfer_file(str(src), str(dest), "move", verify_algorithm="sha256", verify_mode="full")
+    assert src.exists()
+    assert not dest.exists()
+    assert not os.path.exists(partial_path(str(dest)))
+
+
+@pytest.mark.parametrize("mode", ["full", "readback", "sampled"])
+def test_short_copy_is_caught(source, monkeypatch, mode):
+    src, dest = source
+    real_copy = main.copy_file_data
+
+    def short_copy(src_path, dst_path, new_hasher=None):
+        digest = real_copy(src_path, dst_path, new_hasher)
+        with open(dst_path, "r+b") as f:
+            f.truncate(1000)
+        return digest
+
+    monkeypatch.setattr(main, "copy_file_data", short_copy)
+    with pytest.raises(OSError, match="doesn't match the source"):
+        transfer_file(str(src), str(dest), "move", verify_algorithm="sha256", verify_mode=mode)
+    assert src.exists()
+
+
+def test_copies_keep_the_source_and_return_no_digest(source):
+    src, dest = source
+    size, digest = transfer_file(str(src), str(dest), "copy", verify_algorithm="sha256", verify_mode="full")
+    assert size == src.stat().st_size and digest is None
+    assert dest.read_bytes() == src.read_bytes()
+
+
+def test_full_verification_is_the_default(worker):
+    assert worker._move_verification() == "full"
+    worker.performance["verify_cross_device_moves"] = True
+    assert worker._move_verification() == "full"
+    worker.performance["verify_cross_device_moves"] = "Sampled"
+    assert worker._move_verification() == "sampled"